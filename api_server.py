@@ -1,36 +1,299 @@
-from flask import Flask, request, jsonify, send_from_directory
+from flask import Flask, Response, g, request, jsonify
 from flask_cors import CORS
-from typing import Dict, Any, Optional
+from typing import Callable, Dict, Any, Optional, Tuple
 import logging
+import re
+import shutil
+import subprocess
 import sys
+import tempfile
+import contextlib
+import functools
 import json
 import os
-from quantum.bernstein_vazirani import run_bernstein_vazirani
-from quantum.exceptions import QuantumCircuitError, InvalidInputError
+import time
+import uuid
+from quantum.bernstein_vazirani import (run_bernstein_vazirani, run_bernstein_vazirani_batch,
+                                        create_bernstein_vazirani_circuit, METHODS)
+from quantum.cache import ResultCache, make_cache_key
+from quantum.rendering import (RenderQueue, DiagramStore, IMAGE_FORMATS, MIMETYPES, diagram_path,
+                               preload_renderer, READY, PENDING, SKIPPED, UNKNOWN)
+from quantum.simulator import get_simulator, warm_up_simulator
+from quantum.jobs import JobManager, JobStore, QUEUED, RUNNING, DONE, FAILED
+from quantum.profiling import Profiler, stage
+from quantum.exceptions import QuantumCircuitError, InvalidInputError, JobQueueFullError
+from server.static_files import StaticFiles, IMMUTABLE, REVALIDATE
+from server.metrics import MetricsRegistry
+from server.admission import RateLimiter, ConcurrencyLimiter, ServerBusyError, retry_after_header
+from server.structured_logging import configure_logging, parse_sample_rates, request_id_var
 
-# Configure logging
-logging.basicConfig(level=logging.INFO)
-logger = logging.getLogger(__name__)
+# Configure logging: JSON lines with the request id, optionally sampled per logger
+# (e.g. BV_LOG_SAMPLE="api_server=0.1,quantum=0.01"; warnings and errors are always kept)
+configure_logging(
+    level=os.environ.get('BV_LOG_LEVEL', 'INFO').upper(),
+    json_format=os.environ.get('BV_LOG_FORMAT', 'json') == 'json',
+    sample_rates=parse_sample_rates(os.environ.get('BV_LOG_SAMPLE', ''))
+)
+# qiskit logs every transpiler pass at INFO, which dominates the log volume per request
+logging.getLogger('qiskit').setLevel(os.environ.get('BV_QISKIT_LOG_LEVEL', 'WARNING').upper())
+# Named explicitly: run as a script this module is __main__, and BV_LOG_SAMPLE refers to 'api_server'
+logger = logging.getLogger('api_server')
 
 app = Flask(__name__)
 CORS(app)  # Enable CORS for all routes
 
+# Bernstein-Vazirani results are deterministic, so repeat requests are served from memory
+result_cache = ResultCache(
+    maxsize=int(os.environ.get('BV_CACHE_SIZE', '256')),
+    ttl=float(os.environ['BV_CACHE_TTL']) if os.environ.get('BV_CACHE_TTL') else None
+)
+
+# Circuit diagrams are drawn in the background; clients poll /render/<hash>
+render_queue = RenderQueue(maxsize=int(os.environ.get('BV_RENDER_QUEUE_SIZE', '64')))
+
+# Inline diagrams (image_format 'svg' or 'png_base64') are drawn in memory and
+# kept here by circuit hash, so /render/<hash>/image can stream them without disk I/O
+diagram_store = DiagramStore(maxsize=int(os.environ.get('BV_DIAGRAM_STORE_SIZE', '128')))
+
+# Asynchronous jobs run on a pool of worker processes, created on first use.
+# Job records go to BV_JOB_DIR when set (production mode with several workers
+# picks a shared directory itself), so any server process can answer polls
+job_manager = JobManager(
+    max_workers=int(os.environ['BV_JOB_WORKERS']) if os.environ.get('BV_JOB_WORKERS') else None,
+    max_queue=int(os.environ.get('BV_JOB_QUEUE_DEPTH', '100')),
+    store=JobStore(os.environ['BV_JOB_DIR']) if os.environ.get('BV_JOB_DIR') else None
+)
+MAX_JOB_WAIT = 30.0
+
+# Clients may pass their own correlation id; otherwise one is generated per request
+REQUEST_ID_HEADER = 'X-Request-ID'
+VALID_REQUEST_ID = re.compile(r'[A-Za-z0-9._-]{1,128}')
+
+# Admission control for the simulation endpoints: a token bucket per client
+# (BV_RATE_LIMIT requests/s, bursts of BV_RATE_BURST; 0 disables it) and a global
+# cap on concurrent simulations. Only cache misses take a simulation slot; they
+# wait at most BV_ADMISSION_WAIT seconds for one and are shed with 503 beyond
+# that, so tail latency stays bounded
+rate_limiter = RateLimiter(
+    rate=float(os.environ.get('BV_RATE_LIMIT', '10')),
+    burst=int(os.environ.get('BV_RATE_BURST', '20'))
+)
+simulation_slots = ConcurrencyLimiter(
+    limit=int(os.environ.get('BV_MAX_CONCURRENT', '8')),
+    max_wait=float(os.environ.get('BV_ADMISSION_WAIT', '0.05'))
+)
+TRUST_PROXY = os.environ.get('BV_TRUST_PROXY', '') == '1'
+
+# Requests sending this header get per-stage wall/CPU timings in their JSON response
+DEBUG_TIMINGS_HEADER = 'X-Debug-Timings'
+
+# Prometheus-style metrics, scraped from /metrics (per process)
+metrics = MetricsRegistry()
+REQUEST_COUNT = metrics.counter('bv_http_requests_total', 'HTTP requests by route, method and status',
+                                ('route', 'method', 'status'))
+REQUEST_LATENCY = metrics.histogram('bv_http_request_duration_seconds', 'HTTP request latency by route', ('route',))
+REQUESTS_IN_FLIGHT = metrics.gauge('bv_http_requests_in_flight', 'HTTP requests currently being handled')
+PHASE_LATENCY = metrics.histogram('bv_phase_duration_seconds',
+                                  'Time spent in each phase of an algorithm request '
+                                  '(validation, circuit_build, render, simulate, serialize)', ('phase',))
+ADMISSION_WAIT = metrics.histogram('bv_admission_queue_seconds',
+                                   'Time simulation requests waited for a concurrency slot',
+                                   buckets=(0.0001, 0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0))
+ADMISSION_REJECTED = metrics.counter('bv_admission_rejected_total',
+                                     'Requests shed by admission control', ('reason',))
+metrics.gauge('bv_simulations_in_flight', 'Simulation requests holding a concurrency slot',
+              callback=lambda: {(): simulation_slots.in_use})
+metrics.counter('bv_result_cache_requests_total', 'Result cache lookups by outcome', ('result',),
+                callback=lambda: {(outcome,): result_cache.stats()[key]
+                                  for outcome, key in (('hit', 'hits'), ('miss', 'misses'))})
+metrics.gauge('bv_result_cache_hit_ratio', 'Fraction of result cache lookups that were hits',
+              callback=lambda: {(): result_cache.stats()['hit_rate']})
+metrics.gauge('bv_result_cache_size', 'Entries in the result cache', callback=lambda: {(): len(result_cache)})
+metrics.gauge('bv_jobs', 'Tracked asynchronous jobs by status', ('status',),
+              callback=lambda: {(status,): job_manager.stats()[status] for status in (QUEUED, RUNNING, DONE, FAILED)})
+
+# Static files get content-hash ETags and gzip/brotli variants; generated
+# diagrams are named by circuit hash, so they can be cached forever
+static_files = StaticFiles()
+STATIC_MAX_AGE = os.environ.get('BV_STATIC_MAX_AGE', '3600')
+
+# Aer simulates the full state, so it (and diagram rendering) is capped at a few
+# bits; the stabilizer method is polynomial and accepts much longer secrets
+MAX_SECRET_BITS = 7
+MAX_STABILIZER_BITS = int(os.environ.get('BV_MAX_STABILIZER_BITS', '4096'))
+MAX_BATCH_SIZE = int(os.environ.get('BV_MAX_BATCH', '256'))
+# A batch holds a single simulation slot, so its total work is capped: by default
+# it may not carry more secret bits than one maximum-length secret
+MAX_BATCH_BITS = int(os.environ.get('BV_MAX_BATCH_BITS', str(MAX_STABILIZER_BITS)))
+
+def parse_method(data: Dict[str, Any]) -> str:
+    """Read the requested simulation method ('auto', 'aer' or 'stabilizer')"""
+    method = data.get('method', 'auto')
+    if method != 'auto' and method not in METHODS:
+        raise InvalidInputError(f"Unknown method '{method}', expected 'auto' or one of {', '.join(METHODS)}")
+    return method
+
+def parse_image_format(data: Dict[str, Any]) -> str:
+    """Read the requested diagram format ('path', 'svg' or 'png_base64')"""
+    image_format = data.get('image_format', 'path')
+    if image_format not in IMAGE_FORMATS:
+        raise InvalidInputError(f"Unknown image format '{image_format}', expected one of {', '.join(IMAGE_FORMATS)}")
+    return image_format
+
+def validate_secret(secret: Any, method: str) -> Optional[str]:
+    """Return an error message if the secret cannot be run with the method, else None"""
+    max_bits = MAX_SECRET_BITS if method == 'aer' else MAX_STABILIZER_BITS
+    if (not isinstance(secret, str) or not secret or not all(bit in '01' for bit in secret)
+            or len(secret) > max_bits):
+        return f'Invalid input. Please provide a binary string of up to {max_bits} bits.'
+    return None
+
+def resolve_method(method: str, secret: str) -> str:
+    """Turn 'auto' into Aer for short secrets and the stabilizer method for long ones"""
+    if method == 'auto':
+        return 'aer' if len(secret) <= MAX_SECRET_BITS else 'stabilizer'
+    return method
+
+def bv_cache_key(secret: str, render: bool, method: str, image_format: str = 'path') -> Tuple:
+    """Result cache key of a Bernstein-Vazirani run, shared by the single, batch and job endpoints"""
+    return make_cache_key('bernstein_vazirani', secret, render=render, method=method, image_format=image_format)
+
+def cacheable_result(algorithm_result: Dict[str, Any]) -> bool:
+    """
+    Whether a result may be stored in the result cache.
+    
+    A result whose diagram was skipped (render queue full) is not cached:
+    cache hits never resubmit the circuit, so its diagram would never be drawn.
+    """
+    return algorithm_result['render_status'] != SKIPPED
+
+def result_payload(algorithm_result: Dict[str, Any], cached: bool, render: bool) -> Dict[str, Any]:
+    """Build the JSON fields returned for one algorithm result"""
+    render_status = algorithm_result['render_status']
+    if cached and render and algorithm_result['image_format'] == 'path':
+        render_status = render_queue.status(algorithm_result['circuit_hash'])
+        if render_status not in (READY, PENDING):
+            # The render failed, was skipped or its file was removed: queue the diagram again
+            circuit = create_bernstein_vazirani_circuit(algorithm_result['secret'])
+            _, _, render_status = render_queue.submit(circuit)
+    return {
+        'success': True,
+        'result': algorithm_result['result'],
+        'secret': algorithm_result['secret'],
+        'circuit_image': algorithm_result['circuit_image'],
+        'circuit_hash': algorithm_result['circuit_hash'],
+        'render_status': render_status,
+        'image_format': algorithm_result['image_format'],
+        'method': algorithm_result['method'],
+        'cached': cached
+    }
+
+@app.before_request
+def start_request_timer() -> None:
+    # Every request gets a profiler, so stages inside the quantum package are timed
+    g.request_start = time.perf_counter()
+    g.profiler = Profiler().activate()
+    request_id = request.headers.get(REQUEST_ID_HEADER, '')
+    if not VALID_REQUEST_ID.fullmatch(request_id):
+        request_id = uuid.uuid4().hex
+    g.request_id_token = request_id_var.set(request_id)
+    REQUESTS_IN_FLIGHT.inc()
+
+@app.after_request
+def record_request_metrics(response: Response) -> Response:
+    route = request.url_rule.rule if request.url_rule is not None else 'unmatched'
+    REQUEST_COUNT.inc(route=route, method=request.method, status=str(response.status_code))
+    REQUEST_LATENCY.observe(time.perf_counter() - g.request_start, route=route)
+    for phase, seconds in g.profiler.timings().items():
+        PHASE_LATENCY.observe(seconds, phase=phase)
+    
+    if request.headers.get(DEBUG_TIMINGS_HEADER) and response.is_json:
+        payload = response.get_json()
+        if isinstance(payload, dict):
+            payload['timings'] = g.profiler.report()
+            response.set_data(json.dumps(payload))
+    response.headers[REQUEST_ID_HEADER] = request_id_var.get()
+    return response
+
+@app.teardown_request
+def finish_request(error: Optional[BaseException]) -> None:
+    g.profiler.deactivate()
+    request_id_var.reset(g.request_id_token)
+    REQUESTS_IN_FLIGHT.dec()
+
+def client_key() -> str:
+    """Identify the client for rate limiting (first X-Forwarded-For hop behind a trusted proxy)"""
+    if TRUST_PROXY and request.headers.get('X-Forwarded-For'):
+        return request.headers['X-Forwarded-For'].split(',')[0].strip()
+    return request.remote_addr or 'unknown'
+
+def admission_controlled(view: Callable) -> Callable:
+    """
+    Decorator applying the per-client rate limit to a simulation endpoint.
+    
+    Returns:
+        429 with Retry-After when the client is over its rate
+    """
+    @functools.wraps(view)
+    def wrapper(*args: Any, **kwargs: Any):
+        allowed, retry_after = rate_limiter.acquire(client_key())
+        if not allowed:
+            ADMISSION_REJECTED.inc(reason='rate_limited')
+            return jsonify({
+                'success': False,
+                'error': 'Rate limit exceeded, please retry later'
+            }), 429, {'Retry-After': retry_after_header(retry_after)}
+        return view(*args, **kwargs)
+    return wrapper
+
+@contextlib.contextmanager
+def simulation_slot():
+    """
+    Hold a global simulation slot around a cache-miss computation.
+    
+    Cached results are served without one, so they are never shed and do
+    not count toward bv_simulations_in_flight.
+    
+    Raises:
+        ServerBusyError: If no slot frees up within BV_ADMISSION_WAIT seconds
+    """
+    waited = simulation_slots.acquire()
+    if waited is None:
+        ADMISSION_REJECTED.inc(reason='overloaded')
+        raise ServerBusyError('Server is busy, please retry later')
+    ADMISSION_WAIT.observe(waited)
+    try:
+        yield
+    finally:
+        simulation_slots.release()
+
+def server_busy_response(error: ServerBusyError):
+    """503 response for a request shed by the concurrency limit"""
+    logger.warning("%s", error)
+    return jsonify({
+        'success': False,
+        'error': str(error)
+    }), 503, {'Retry-After': retry_after_header(simulation_slots.max_wait)}
+
 @app.route('/')
 def index():
     """Serve the main page"""
-    return send_from_directory('html', 'index.html')
+    return static_files.send('html', 'index.html', REVALIDATE)
 
 @app.route('/doc/<path:filename>')
 def serve_doc(filename):
     """Serve documentation files"""
-    return send_from_directory('html/doc', filename)
+    return static_files.send('html/doc', filename, REVALIDATE)
 
 @app.route('/pictures/<path:filename>')
 def serve_pictures(filename):
     """Serve picture files"""
-    return send_from_directory('pictures', filename)
+    if re.fullmatch(r'bernstein_vazirani/circuit_[0-9a-f]{16}\.png', filename):
+        return static_files.send('pictures', filename, IMMUTABLE)
+    return static_files.send('pictures', filename, f'public, max-age={STATIC_MAX_AGE}')
 
 @app.route('/run_bernstein_vazirani', methods=['POST'])
+@admission_controlled
 def handle_algorithm() -> Dict[str, Any]:
     """
     Handle Bernstein-Vazirani algorithm execution requests.
@@ -40,57 +303,461 @@ def handle_algorithm() -> Dict[str, Any]:
     
     Raises:
         400: If input is invalid
+        429: If the client exceeds its rate limit
+        500: If there's an internal server error
+        503: If too many simulations are already running and the result is not cached
+    """
+    try:
+        logger.debug("Received request to run Bernstein-Vazirani algorithm")
+        with stage('validation'):
+            data = request.get_json()
+            if not data:
+                raise InvalidInputError("No data received")
+            
+            secret = data.get('secret', '')
+            method = parse_method(data)
+            image_format = parse_image_format(data)
+            logger.debug("Input secret (left to right): %s", secret)
+            
+            # Validate input
+            error = validate_secret(secret, method)
+            if error:
+                return jsonify({
+                    'success': False,
+                    'error': error
+                }), 400
+            method = resolve_method(method, secret)
+            render = bool(data.get('render', True)) and len(secret) <= MAX_SECRET_BITS
+        
+        # Run algorithm (or reuse a cached result for the same secret)
+        def simulate() -> Dict[str, Any]:
+            with simulation_slot():
+                return run_bernstein_vazirani(secret, render=render, render_queue=render_queue,
+                                              method=method, image_format=image_format,
+                                              diagram_store=diagram_store)
+        
+        cache_key = bv_cache_key(secret, render, method, image_format)
+        algorithm_result, cached = result_cache.get_or_compute(cache_key, simulate, cacheable=cacheable_result)
+
+        logger.info("Algorithm completed. Secret recovered: %s (cached: %s)", algorithm_result['result'], cached,
+                    extra={'secret_bits': len(secret), 'method': method, 'cached': cached})
+        with stage('serialize'):
+            return jsonify(result_payload(algorithm_result, cached, render))
+        
+    except InvalidInputError as e:
+        logger.warning("Invalid input: %s", e)
+        return jsonify({
+            'success': False,
+            'error': str(e)
+        }), 400
+    except ServerBusyError as e:
+        return server_busy_response(e)
+    except QuantumCircuitError as e:
+        logger.error("Quantum circuit error: %s", e)
+        return jsonify({
+            'success': False,
+            'error': str(e)
+        }), 500
+    except Exception as e:
+        logger.exception("Unexpected error: %s", e)
+        return jsonify({
+            'success': False,
+            'error': str(e)
+        }), 500
+
+@app.route('/run_bernstein_vazirani/batch', methods=['POST'])
+@admission_controlled
+def handle_algorithm_batch() -> Dict[str, Any]:
+    """
+    Handle Bernstein-Vazirani execution for a list of secrets in one request.
+    
+    Cached secrets are answered from the result cache; the rest are run as a
+    single multi-circuit simulator job. Invalid secrets get a per-entry error.
+    
+    Returns:
+        Dict[str, Any]: JSON response with one result per secret, in request order
+    
+    Raises:
+        400: If the request body is invalid (including more than BV_MAX_BATCH_BITS secret bits)
+        429: If the client exceeds its rate limit
         500: If there's an internal server error
+        503: If too many simulations are already running and some secrets are not cached
     """
     try:
-        logger.info("Received request to run Bernstein-Vazirani algorithm")
         data = request.get_json()
         if not data:
             raise InvalidInputError("No data received")
-            
-        secret = data.get('secret', '')
-        logger.info(f"Input secret (left to right): {secret}")
         
-        circuit_image_path: Optional[str] = None
+        secrets = data.get('secrets')
+        method = parse_method(data)
+        image_format = parse_image_format(data)
+        if not isinstance(secrets, list) or not secrets:
+            raise InvalidInputError("'secrets' must be a non-empty list of binary strings")
+        if len(secrets) > MAX_BATCH_SIZE:
+            raise InvalidInputError(f"At most {MAX_BATCH_SIZE} secrets per batch")
+        if sum(len(secret) for secret in secrets if isinstance(secret, str)) > MAX_BATCH_BITS:
+            raise InvalidInputError(f"At most {MAX_BATCH_BITS} secret bits in total per batch")
+        logger.debug("Received batch of %d Bernstein-Vazirani secrets", len(secrets))
+        
+        payloads: Dict[str, Dict[str, Any]] = {}
+        pending: Dict[Any, list] = {}   # (method, render) -> secrets to simulate
+        simulated = 0
+        for secret in secrets:
+            if validate_secret(secret, method) or secret in payloads:
+                continue
+            secret_method = resolve_method(method, secret)
+            render = bool(data.get('render', False)) and len(secret) <= MAX_SECRET_BITS
+            cached_result = result_cache.get(bv_cache_key(secret, render, secret_method, image_format))
+            if cached_result is not None:
+                payloads[secret] = result_payload(cached_result, True, render)
+            else:
+                payloads[secret] = {}
+                pending.setdefault((secret_method, render), []).append(secret)
+        
+        # Run the cache misses of each method as one simulator job, under one simulation slot
+        with simulation_slot() if pending else contextlib.nullcontext():
+            for (secret_method, render), group in pending.items():
+                batch = run_bernstein_vazirani_batch(group, render=render, render_queue=render_queue,
+                                                     method=secret_method, image_format=image_format,
+                                                     diagram_store=diagram_store)
+                for algorithm_result in batch:
+                    secret = algorithm_result['secret']
+                    if cacheable_result(algorithm_result):
+                        result_cache.set(bv_cache_key(secret, render, secret_method, image_format), algorithm_result)
+                    payloads[secret] = result_payload(algorithm_result, False, render)
+                simulated += len(group)
+        
+        results = []
+        for secret in secrets:
+            error = validate_secret(secret, method)
+            results.append({'success': False, 'error': error, 'secret': secret} if error else payloads[secret])
         
-        # Validate input
-        if not secret or not all(bit in '01' for bit in secret) or len(secret) > 7:
+        logger.info("Batch completed: %d simulated, %d cached", simulated, len(payloads) - simulated,
+                    extra={'batch_size': len(secrets)})
+        with stage('serialize'):
             return jsonify({
-                'success': False,
-                'error': 'Invalid input. Please provide a binary string of up to 7 bits.'
-            }), 400
+                'success': True,
+                'results': results
+            })
         
-        # Run algorithm
-        algorithm_result = run_bernstein_vazirani(secret)
+    except InvalidInputError as e:
+        logger.warning("Invalid input: %s", e)
+        return jsonify({
+            'success': False,
+            'error': str(e)
+        }), 400
+    except ServerBusyError as e:
+        return server_busy_response(e)
+    except QuantumCircuitError as e:
+        logger.error("Quantum circuit error: %s", e)
+        return jsonify({
+            'success': False,
+            'error': str(e)
+        }), 500
+    except Exception as e:
+        logger.exception("Unexpected error: %s", e)
+        return jsonify({
+            'success': False,
+            'error': str(e)
+        }), 500
+
+def job_payload(snapshot: Dict[str, Any]) -> Dict[str, Any]:
+    """Build the JSON fields returned for a job status"""
+    payload = {key: value for key, value in snapshot.items() if key != 'result'}
+    payload['success'] = snapshot['status'] != FAILED
+    if snapshot['status'] == DONE:
+        payload['result'] = result_payload(snapshot['result'], False, False)
+    return payload
 
-        logger.info(f"Algorithm completed. Secret recovered: {algorithm_result['result']}")
+@app.route('/jobs', methods=['POST'])
+@admission_controlled
+def submit_job() -> Dict[str, Any]:
+    """
+    Queue a Bernstein-Vazirani run on the worker pool and return its job id.
+    
+    Accepts the same body as /run_bernstein_vazirani. Poll /jobs/<job_id>
+    (optionally with ?wait=<seconds>), stream /jobs/<job_id>/events, or fetch
+    /jobs/<job_id>/result.
+    
+    Returns:
+        Dict[str, Any]: JSON response with the job id and its URLs
+    
+    Raises:
+        400: If input is invalid
+        429: If the client exceeds its rate limit
+        500: If there's an internal server error
+        503: If the job queue is full or the job workers are unavailable
+    """
+    try:
+        data = request.get_json()
+        if not data:
+            raise InvalidInputError("No data received")
+        
+        secret = data.get('secret', '')
+        method = parse_method(data)
+        image_format = parse_image_format(data)
+        error = validate_secret(secret, method)
+        if error:
+            raise InvalidInputError(error)
+        method = resolve_method(method, secret)
+        render = bool(data.get('render', True)) and len(secret) <= MAX_SECRET_BITS
+        
+        cache_key = bv_cache_key(secret, render, method, image_format)
+        job_id = job_manager.submit(run_bernstein_vazirani, secret, render=render, method=method,
+                                    image_format=image_format,
+                                    on_done=lambda result: result_cache.set(cache_key, result))
+        logger.info("Queued job %s for secret %s", job_id, secret)
         return jsonify({
             'success': True,
-            'result': algorithm_result['result'],
-            'secret': algorithm_result['secret'],
-            'circuit_image': algorithm_result['circuit_image']
-        })
+            'job_id': job_id,
+            'status_url': f'/jobs/{job_id}',
+            'events_url': f'/jobs/{job_id}/events',
+            'result_url': f'/jobs/{job_id}/result'
+        }), 202
         
     except InvalidInputError as e:
-        logger.warning(f"Invalid input: {str(e)}")
+        logger.warning("Invalid input: %s", e)
         return jsonify({
             'success': False,
             'error': str(e)
         }), 400
-    except QuantumCircuitError as e:
-        logger.error(f"Quantum circuit error: {str(e)}")
+    except JobQueueFullError as e:
+        logger.warning("%s", e)
         return jsonify({
             'success': False,
             'error': str(e)
-        }), 500
+        }), 503, {'Retry-After': '1'}
+    except RuntimeError as e:
+        # The worker pool could not take the job (broken and not restartable, or shutting down)
+        logger.error("Job pool unavailable: %s", e)
+        return jsonify({
+            'success': False,
+            'error': 'Job workers are unavailable, try again later'
+        }), 503, {'Retry-After': '1'}
     except Exception as e:
-        logger.exception(f"Unexpected error: {str(e)}")
+        logger.exception("Unexpected error: %s", e)
         return jsonify({
             'success': False,
             'error': str(e)
         }), 500
 
+@app.route('/jobs/<job_id>', methods=['GET'])
+def job_status(job_id: str) -> Dict[str, Any]:
+    """Report a job's status; ?wait=<seconds> long-polls until it finishes"""
+    wait = min(max(request.args.get('wait', 0.0, type=float), 0.0), MAX_JOB_WAIT)
+    snapshot = job_manager.get(job_id, wait=wait)
+    if snapshot is None:
+        return jsonify({'success': False, 'error': 'Unknown job id'}), 404
+    return jsonify(job_payload(snapshot))
+
+@app.route('/jobs/<job_id>/result', methods=['GET'])
+def job_result(job_id: str) -> Dict[str, Any]:
+    """Return a job's result: 200 when done, 202 while pending, 500 if it failed"""
+    snapshot = job_manager.get(job_id)
+    if snapshot is None:
+        return jsonify({'success': False, 'error': 'Unknown job id'}), 404
+    payload = job_payload(snapshot)
+    if snapshot['status'] == DONE:
+        return jsonify(payload['result'])
+    return jsonify(payload), 500 if snapshot['status'] == FAILED else 202
+
+@app.route('/jobs/<job_id>/events', methods=['GET'])
+def job_events(job_id: str):
+    """Stream a job's status changes as server-sent events until it finishes"""
+    if job_manager.get(job_id) is None:
+        return jsonify({'success': False, 'error': 'Unknown job id'}), 404
+    
+    def stream():
+        last_status = None
+        while True:
+            snapshot = job_manager.get(job_id, wait=1.0)
+            if snapshot is None:
+                return
+            if snapshot['status'] != last_status:
+                last_status = snapshot['status']
+                yield f"event: status\ndata: {json.dumps(job_payload(snapshot))}\n\n"
+            if snapshot['finished_at'] is not None:
+                return
+    
+    return Response(stream(), mimetype='text/event-stream', headers={'Cache-Control': 'no-cache'})
+
+@app.route('/jobs/stats', methods=['GET'])
+def jobs_stats() -> Dict[str, Any]:
+    """Report job counts by status and the worker pool configuration"""
+    return jsonify(job_manager.stats())
+
+@app.route('/render/<digest>', methods=['GET'])
+def render_status(digest: str) -> Dict[str, Any]:
+    """Report whether the diagram for a circuit hash has been rendered"""
+    status = render_queue.status(digest)
+    return jsonify({
+        'circuit_hash': digest,
+        'render_status': status,
+        'circuit_image': diagram_path(digest) if status == READY else None
+    }), 404 if status == UNKNOWN else 200
+
+@app.route('/render/<digest>/image', methods=['GET'])
+def render_image(digest: str):
+    """
+    Serve the diagram for a circuit hash, or 202 while it is still rendering.
+    
+    Diagrams drawn in memory are streamed from the diagram store; pass
+    ?format=svg for the SVG version (PNG by default).
+    """
+    image_format = request.args.get('format', 'png')
+    if image_format not in MIMETYPES:
+        return jsonify({
+            'success': False,
+            'error': f"Unknown format '{image_format}', expected one of {', '.join(MIMETYPES)}"
+        }), 400
+    image = diagram_store.get(digest, image_format)
+    if image is not None:
+        response = Response(image, mimetype=MIMETYPES[image_format])
+        response.set_etag(f'{digest}-{image_format}')
+        response.headers['Cache-Control'] = IMMUTABLE
+        return response.make_conditional(request)
+    # Background renders are only written to disk as PNG
+    status = render_queue.status(digest) if image_format == 'png' else UNKNOWN
+    if status == READY:
+        return static_files.send(render_queue.directory, os.path.basename(diagram_path(digest)), IMMUTABLE)
+    return jsonify({
+        'circuit_hash': digest,
+        'render_status': status
+    }), 404 if status == UNKNOWN else 202
+
+@app.route('/cache/stats', methods=['GET'])
+def cache_stats() -> Dict[str, Any]:
+    """Report hit/miss counters of the algorithm result cache"""
+    return jsonify(result_cache.stats())
+
+@app.route('/metrics', methods=['GET'])
+def metrics_endpoint() -> Response:
+    """Expose request, phase, cache and job metrics in the Prometheus text format"""
+    return Response(metrics.render(), content_type=MetricsRegistry.CONTENT_TYPE)
+
+def report_import_times(limit: int = 20) -> None:
+    """
+    Print the slowest modules of a cold `import api_server`, measured in a fresh
+    interpreter with `python -X importtime`, to track cold-start regressions.
+    
+    Args:
+        limit (int): Number of modules to list, slowest cumulative time first
+    """
+    proc = subprocess.run([sys.executable, '-X', 'importtime', '-c', 'import api_server'],
+                          capture_output=True, text=True,
+                          cwd=os.path.dirname(os.path.abspath(__file__)))
+    rows = []
+    for line in proc.stderr.splitlines():
+        if not line.startswith('import time:') or 'self [us]' in line:
+            continue
+        self_us, cumulative_us, name = line[len('import time:'):].split('|')
+        rows.append((int(cumulative_us), int(self_us), name.strip()))
+    if proc.returncode != 0 or not rows:
+        sys.exit(f"Import timing failed:\n{proc.stderr}")
+    
+    total_us = next(cumulative for cumulative, _, name in rows if name == 'api_server')
+    print(f"Cold import of api_server: {total_us / 1000:.1f} ms")
+    print(f"{'cumulative ms':>14} {'self ms':>9}  module")
+    for cumulative_us, self_us, name in sorted(rows, reverse=True)[:limit]:
+        print(f"{cumulative_us / 1000:>14.1f} {self_us / 1000:>9.1f}  {name}")
+    for heavy in ('qiskit', 'qiskit_aer', 'matplotlib'):
+        if any(name == heavy for _, _, name in rows):
+            print(f"warning: {heavy} is imported at startup")
+
+def run_production(host: str, port: int, workers: int, threads: int, graceful_timeout: int) -> None:
+    """
+    Serve the app with gunicorn using pre-forked worker processes.
+    
+    The app is preloaded in the master process, which also imports qiskit and
+    builds the simulator backend, so forked workers share those pages
+    copy-on-write instead of each paying the import. The warm-up run happens
+    in each worker after the fork: Aer's OpenMP runtime deadlocks in a child
+    forked from a process that has already run a simulation. Worker pools and
+    render threads are created lazily, inside each worker. On SIGTERM, workers
+    get graceful_timeout seconds to finish in-flight requests.
+    
+    Each worker gets its own job pool, so the CPUs are split between them
+    (unless BV_JOB_WORKERS is set) instead of every worker starting one process
+    per CPU. With more than one worker, job records are kept in a shared
+    directory (BV_JOB_DIR, or a temporary one) so any worker can answer
+    /jobs/<id> for a job accepted by another.
+    
+    Args:
+        host (str): Interface to bind
+        port (int): Port to bind
+        workers (int): Number of worker processes
+        threads (int): Request threads per worker
+        graceful_timeout (int): Seconds workers get to finish requests on shutdown
+    """
+    try:
+        from gunicorn.app.base import BaseApplication
+    except ImportError:
+        sys.exit("Production mode requires gunicorn: pip install gunicorn")
+    
+    if not os.environ.get('BV_JOB_WORKERS'):
+        job_manager.configure(max_workers=(os.cpu_count() or 1) // workers)
+    temporary_job_dir = None
+    if workers > 1 and job_manager.store is None:
+        temporary_job_dir = tempfile.mkdtemp(prefix='bv-jobs-')
+        job_manager.configure(store=JobStore(temporary_job_dir))
+    if job_manager.store is not None:
+        logger.info("Job records shared through %s", job_manager.store.directory)
+    
+    def post_fork(server, worker):
+        warm_up_simulator()
+    
+    def worker_exit(server, worker):
+        # Let running jobs finish, drop the ones that never started
+        job_manager.shutdown(wait=True, cancel_pending=True)
+    
+    def on_exit(server):
+        if temporary_job_dir is not None:
+            shutil.rmtree(temporary_job_dir, ignore_errors=True)
+    
+    class ProductionServer(BaseApplication):
+        def load_config(self):
+            self.cfg.set('bind', f'{host}:{port}')
+            self.cfg.set('workers', workers)
+            self.cfg.set('threads', threads)
+            self.cfg.set('worker_class', 'gthread' if threads > 1 else 'sync')
+            self.cfg.set('preload_app', True)
+            self.cfg.set('graceful_timeout', graceful_timeout)
+            self.cfg.set('post_fork', post_fork)
+            self.cfg.set('worker_exit', worker_exit)
+            self.cfg.set('on_exit', on_exit)
+        
+        def load(self):
+            return app
+    
+    logger.info("Starting production server on %s:%d with %d workers x %d threads", host, port, workers, threads)
+    ProductionServer().run()
+
 if __name__ == '__main__':
+    import argparse
+    
+    parser = argparse.ArgumentParser(description='Quantum algorithms API server')
+    parser.add_argument('--production', action='store_true',
+                        help='serve with multi-worker gunicorn instead of the Flask dev server')
+    parser.add_argument('--host', default=os.environ.get('BV_HOST', '127.0.0.1'))
+    parser.add_argument('--port', type=int, default=int(os.environ.get('BV_PORT', '5000')))
+    # One worker process by default: job state, caches and metrics stay in one
+    # place. Aer runs are not serialized (quantum.simulator) and release the GIL
+    # while simulating, so request threads run simulations in parallel
+    parser.add_argument('--workers', type=int, default=int(os.environ.get('BV_WORKERS', '1')),
+                        help='worker processes in production mode')
+    parser.add_argument('--threads', type=int,
+                        default=int(os.environ.get('BV_THREADS', str(2 * (os.cpu_count() or 1) + 1))),
+                        help='request threads per worker in production mode')
+    parser.add_argument('--graceful-timeout', type=int, default=30,
+                        help='seconds workers get to finish requests on shutdown')
+    parser.add_argument('--import-times', action='store_true',
+                        help='print a cold-start import time breakdown and exit')
+    args = parser.parse_args()
+    
+    if args.import_times:
+        report_import_times()
+        sys.exit(0)
+    
     # Ensure required directories exist
     os.makedirs('pictures/bernstein_vazirani', exist_ok=True)
     
@@ -98,5 +765,14 @@ if __name__ == '__main__':
     app.static_folder = 'html'
     app.static_url_path = ''
     
-    logger.info("Starting Flask server...")
-    app.run(port=5000, debug=True)
\ No newline at end of file
+    if args.production:
+        # Import qiskit, Aer and matplotlib once in the master; workers warm up after forking
+        get_simulator()
+        preload_renderer()
+        static_files.precompress('html')
+        run_production(args.host, args.port, args.workers, args.threads, args.graceful_timeout)
+    else:
+        # Build the shared simulator before accepting requests (logs its init time)
+        warm_up_simulator()
+        logger.info("Starting Flask server...")
+        app.run(host=args.host, port=args.port, debug=True)
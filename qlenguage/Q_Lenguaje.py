@@ -11,10 +11,25 @@
 #22/06/22 agregada groverUs()
 #06/07/22 agregada reset()
 #11/09/22 agregada cxNqubit()
-
-
-from qlenguage.matrices import *
+#18/10/26 usa el motor vectorizado matrices_np (NumPy) en lugar de matrices
+#18/10/26 agregada aplicar() y qubitNro opcional en h(), x(), etc. para compuertas locales O(2^n)
+#18/10/26 cxNqubit() y oráculos como permutaciones (qlenguage.permutaciones)
+#18/10/26 medirEnsamble() sortea todas las mediciones juntas; agregada conteos()
+#18/10/26 colapsar() y graficar() usan máscaras de bits (qlenguage.indices) en lugar de format()/eval()
+#18/10/26 agregadas medirParcial() y ramificar() para mediciones intermedias
+#18/10/26 agregado qlenguage.densidad: matrices densidad y canales de ruido (Kraus)
+#18/10/26 agregado qlenguage.grover (Difusor y OraculoFase implícitos); groverUs() arma la matriz directamente
+#18/10/26 agregado qlenguage.circuito: Circuito diferido con fusión de compuertas de 1 qubit y diagonales
+
+
+from qlenguage.matrices_np import *
+from qlenguage import vectorestado as ve
+from qlenguage import indices as ix
+from qlenguage.permutaciones import Permutacion, cnot, toffoli, mcx, oraculo
+from qlenguage.grover import Difusor, OraculoFase, grover, buscar, iteracionesOptimas
+from qlenguage.circuito import Circuito
 import math
+import numpy as np
 import random
 import matplotlib.pyplot as plt
 
@@ -95,31 +110,56 @@ Uxor2 = [[1, 0, 0, 0, 0, 0, 0, 0], [0, 1, 0, 0, 0, 0, 0, 0], [0, 0, 0, 1, 0, 0,
     # f(0,0)=1, f(0,1)=1, f(1,0)=1, f(1,1)=1 ; Constante (siempre=1)
 Ucte2 = [[0, 1, 0, 0, 0, 0, 0, 0], [1, 0, 0, 0, 0, 0, 0, 0], [0, 0, 0, 1, 0, 0, 0, 0], [0, 0, 1, 0, 0, 0, 0, 0], [0, 0, 0, 0, 0, 1, 0, 0], [0, 0, 0, 0, 1, 0, 0, 0], [0, 0, 0, 0, 0, 0, 0, 1], [0, 0, 0, 0, 0, 0, 1, 0]]
 
+ #Los mismos oráculos como permutaciones (memoria y tiempo O(2^n))
+    #O.matriz() retorna la matriz densa, ej: Oand2.matriz() == Uand2
+O00 = oraculo(lambda a: 0, 1)
+O01 = oraculo(lambda a: a, 1)
+O10 = oraculo(lambda a: 1 - a, 1)
+O11 = oraculo(lambda a: 1, 1)
+Oand2 = oraculo(lambda a, b: a & b, 2)
+Oxor2 = oraculo(lambda a, b: a ^ b, 2)
+Octe2 = oraculo(lambda a, b: 1, 2)
+
 ## Funciones ##
 
-def h(v):
-    return(multiplicar(H, v))
+def aplicar(vector, U, *qubits):   #Aplica la compuerta U (de 1 o 2 qubits) a los qubits indicados
+                                   #de un n-qubit sin armar la matriz de 2^n x 2^n
+    if (len(vector[0]) != 1): #si no es vector columna retorna 0 y termina
+        return(0)
+    try:
+        psi = ve.aplicar(ve.aVector(vector), U, qubits)
+    except ValueError:        #qubits fuera de rango o compuerta de tamaño incorrecto
+        return(0)
+    return(ve.aColumna(psi, vector, U))
+
+def compuerta(U, v, qubitNro=None):  #Aplica U a un qubit v, o al qubitNro si v es un n-qubit
+    if qubitNro is None:
+        return(multiplicar(U, v))
+    return(aplicar(v, U, qubitNro))
 
-def x(v):
-    return(multiplicar(X, v))
+def h(v, qubitNro=None):
+    return(compuerta(H, v, qubitNro))
 
-def y(v):
-    return(multiplicar(Y, v))
+def x(v, qubitNro=None):
+    return(compuerta(X, v, qubitNro))
 
-def z(v):
-    return(multiplicar(Z, v))
+def y(v, qubitNro=None):
+    return(compuerta(Y, v, qubitNro))
 
-def s(v):
-    return(multiplicar(S, v))
+def z(v, qubitNro=None):
+    return(compuerta(Z, v, qubitNro))
 
-def sdg(v):
-    return(multiplicar(Sdg, v))
+def s(v, qubitNro=None):
+    return(compuerta(S, v, qubitNro))
 
-def t(v):
-    return(multiplicar(T, v))
+def sdg(v, qubitNro=None):
+    return(compuerta(Sdg, v, qubitNro))
 
-def tdg(v):
-    return(multiplicar(Tdg, v))
+def t(v, qubitNro=None):
+    return(compuerta(T, v, qubitNro))
+
+def tdg(v, qubitNro=None):
+    return(compuerta(Tdg, v, qubitNro))
 
 def cx(v0, v1):
     R = multiplicar(Cx, tensorial(v0,v1))
@@ -129,30 +169,26 @@ def xc(v0, v1):
     R = multiplicar(Xc, tensorial(v0,v1))
     return(R)
 
+def cxn(vector, control, target):  #Aplica Controled Not del qubit control al qubit target de un n-qubit
+    if (control == target):
+        return(0)
+    return(aplicar(vector, Cx, control, target))
+
+def ketCeros(cantqubits):  #Estado |00...0> de cantqubits qubits como ndarray (modo nativo)
+    return(ve.ceros(cantqubits).reshape(-1, 1))
+
 
 def cxNqubit(cantqubits, control, target): # Retorna compuerta Controled Not del qubit control al qubit target
                                            # para un nqubit, q0,q1,....q(cantqubits-1)
     if (cantqubits < 2 or control >= cantqubits or target >=cantqubits or control==target): #chequea si hay errores
         return(0)
-    filas=int(2**cantqubits)
-    R = I                      # Matriz Identidad 2x2
-    for j in range (cantqubits-1):
-        R = tensorial(I, R)    #  Matriz Identidad 2^cantqubits x 2^cantqubits
-    for f in range (filas):
-        b = format(f,"b").zfill(cantqubits) # arma código binario ('000...' a '111...'
-        if(b[control]=="1"):   # si qubit control == 1
-            valort = eval(b[target]) ^ 1 # b[target] XOR 1
-            columna = 0
-            for j in range(cantqubits):
-                if j != target:
-                    columna += eval(b[j]) * 2**(cantqubits-1-j)
-            columna += valort * (2**(cantqubits-1-target)) #columna con un 1 en la fila
-            for c in range (filas):
-                if c==columna:
-                    R[f][c]=1
-                else:
-                    R[f][c]=0
-    return(R)
+    return(cnot(cantqubits, control, target).matriz()) # matriz densa; usar cnot() o cxn() para no armarla
+
+
+def operar(U, v):   #Aplica el operador U (matriz, Permutacion, Difusor u OraculoFase) al vector v
+    if isinstance(U, (Permutacion, Difusor, OraculoFase)):
+        return(U.aplicar(v))
+    return(multiplicar(U, v))
 
 
 def proba(M):   #Matriz de probabilidades
@@ -168,8 +204,8 @@ def rotar(radianes):  #Matriz de rotacion de radianes alrededor del eje z (Phase
     R=[[1,0],[0,math.e**complex(0,radianes)]]
     return(R)
 
-def p(radianes, vector):  #Phase shift (rotar vector alrededor de Z)
-	return(multiplicar(rotar(radianes),vector))
+def p(radianes, vector, qubitNro=None):  #Phase shift (rotar vector alrededor de Z)
+	return(compuerta(rotar(radianes), vector, qubitNro))
 
 def medir(qubit):   #Operador de medición de un n-qubit
     posicion=[]
@@ -186,14 +222,14 @@ def medir(qubit):   #Operador de medición de un n-qubit
             q[i].append(0)
     return(q)
 
-def medirEnsamble(nqubit, repeticiones): #Mide repeticiones veces para estadística
-    mediciones=[]  #Vector para sumar los resultados de cada medición
-    for i in range (len(nqubit)):  #inicializa en 0
-        mediciones.append([])
-        mediciones[i].append(0)
-    for i in range (repeticiones):  #Mide y suma el resultado a mediciones
-        mediciones = sumar(mediciones, medir(nqubit))
-    return(mediciones)      #Retorna vector suma de mediciones para cada estado
+def medirEnsamble(nqubit, repeticiones, semilla=None): #Mide repeticiones veces para estadística
+    #semilla (opcional) hace reproducibles las mediciones
+    mediciones = ve.muestrearVector(ve.aVector(nqubit), repeticiones, semilla) #sortea todas juntas
+    return(ve.aColumna(mediciones, nqubit))      #Retorna vector suma de mediciones para cada estado
+
+
+def conteos(nqubit, repeticiones, semilla=None): #Como medirEnsamble() pero retorna diccionario
+    return(ve.muestrear(ve.aVector(nqubit), repeticiones, semilla)) # {'00': 512, '11': 488}
 
 
 def fase(vector):   #Calcula las fases de cada componente de un vector de estado
@@ -228,43 +264,84 @@ def colapsar(vector, qubitNro, valor):   #Retorna qubit resultante después de m
     if (len(vector[0]) != 1): #si no es vector columna retorna 0 y termina
         return(0)
     digitos=int(math.log(len(vector),2))
-    q=[]
-    for i in range (len(vector)):   # para cada elemento del vector de entrada
-        ib=format(i,"b").zfill(digitos) # arma código binario ('000...' a '111...')
-        q.append([])
-        if(eval(ib[qubitNro])==valor):  # pasa estados que correspondan
-            q[i].append(vector[i][0])   # con su valor de amplitud
-        else:
-            q[i].append(0)              # y el resto los deja con amplitud 0
-    return(normalizar(q))           # Retorna qubit resultante normalizado
+    if not 0 <= qubitNro < digitos: #si qubitNro fuera de rango retorna 0 y termina
+        return(0)
+    psi = ve.aVector(vector)
+    psi[~ix.seleccion(digitos, qubitNro, valor)] = 0   # deja en 0 los estados que no correspondan
+    if ve.normalizar(psi) is None:      #si la norma==0 no puede normalizar vector
+        return(0)
+    return(ve.aColumna(psi, vector, float))    # Retorna qubit resultante normalizado
+
+
+def medirParcial(vector, qubits, semilla=None):   #Mide sólo algunos qubits de un n-qubit
+    #qubits: número de qubit o lista de qubits; semilla (opcional) hace reproducible la medición
+    #Retorna (bits medidos, qubit resultante normalizado), o 0 si hay error
+    if (len(vector[0]) != 1): #si no es vector columna retorna 0 y termina
+        return(0)
+    if isinstance(qubits, int):
+        qubits = [qubits]
+    try:
+        bits, psi = ve.medirQubits(ve.aVector(vector), qubits, semilla)
+    except ValueError:        #qubits repetidos o fuera de rango
+        return(0)
+    return(bits, ve.aColumna(psi, vector, float))
+
+
+def ramificar(vector, programa, tiros, semilla=None):  #Simula tiros de un programa con mediciones intermedias
+    #programa: lista de pasos, cada uno es una función f(v, bits) que retorna el nuevo vector
+    #(v es un vector columna ndarray, bits la tupla de bits medidos hasta ese paso)
+    #o una tupla ('medir', [qubits]). Cada rama distinta se simula una sola vez.
+    #Ej. teleportación del qubit 0 al qubit 2 (par de Bell en los qubits 1 y 2):
+    #  def bob(v, b):
+    #      if b[1]: v = x(v, 2)
+    #      if b[0]: v = z(v, 2)
+    #      return(v)
+    #  ramificar(v, [lambda v, b: h(cxn(v, 0, 1), 0), ('medir', [0, 1]), bob, ('medir', [2])], 1000)
+    #Retorna diccionario {'bits medidos': (cantidad de tiros, vector final de la rama)}, o 0 si hay error
+    if (len(vector[0]) != 1): #si no es vector columna retorna 0 y termina
+        return(0)
+    try:
+        ve.validarPrograma(ve.cantQubits(vector), programa)
+    except ValueError:        #paso desconocido o qubits repetidos o fuera de rango
+        return(0)
+    dimension = len(vector)
+    def columna(f):             #los pasos reciben y retornan vectores columna
+        def paso(psi, bits):
+            v = f(psi.reshape(-1, 1), bits)
+            if np.shape(v) != (dimension, 1):   #el paso falló (p.ej. retornó 0) o cambió la dimensión
+                raise ValueError("el paso no retornó un vector columna de la dimensión del programa")
+            return(ve.aVector(v))
+        return(paso)
+    pasos = [columna(paso) if callable(paso) else paso for paso in programa]
+    try:
+        ramas = ve.ramificar(ve.aVector(vector), pasos, tiros, semilla)
+    except ValueError:        #algún paso no retornó un vector válido
+        return(0)
+    return({bits: (cuenta, ve.aColumna(psi, vector, float)) for bits, (cuenta, psi) in ramas.items()})
 
 
 def reset(vector, qubitNro):    #Retorna qubit resultante después de resetear qubitNro a estado }0>
+    #(sólo para estados puros; para estados mixtos usar densidad.reset())
+    if (len(vector[0]) != 1): #si no es vector columna retorna 0 y termina
+        return(0)
     cantqubits=int(math.log(len(vector),2)) #cantidad de qubits del vector
-    if ((len(vector[0]) != 1) or (qubitNro >= cantqubits)): #si no es vector columna o qubitNro fuera de rango retorna 0 y termina
+    if (qubitNro >= cantqubits): #si qubitNro fuera de rango retorna 0 y termina
+        return(0)
+    psi = ve.aplicar1q(ve.aVector(vector), Rst, qubitNro) #aplica Rst solo sobre qubitNro
+    if ve.normalizar(psi) is None:      #si la norma==0 no puede normalizar vector
         return(0)
-    Rn = Rst                    #matriz para resetear un 1qubit a estado |0>
-    for i in range (cantqubits):  #arma la matriz para resetear el qubitNro del vector
-        if(i<qubitNro):
-            Rn = tensorial(I,Rn)
-        elif(i>qubitNro):
-            Rn = tensorial(Rn,I)
-    q = normalizar(multiplicar(Rn, vector)) #resetea el qubitNro del vector y normaliza
-    return(q)                               #retorna el nuevo vector con el qubitNro en estado |0>
+    return(ve.aColumna(psi, vector, Rst, float))    #retorna el nuevo vector con el qubitNro en estado |0>
 
 
 def graficar(qubit):   #Grafica qubit (amplitudes vector de estado y probas)
     if (len(qubit[0]) > 1): #si no es vector columna retorna 0 y termina
         return(0)
     digitos=int(math.log(len(qubit),2))
-    eje_x = []
-    eje_y1 = trasponer(qubit)[0]
-    eje_y2 = trasponer(proba(qubit))[0]
-    eje_y3 = trasponer(fase(qubit))[0]
-    for i in range (len(qubit)):
-        ib=format(i,"b").zfill(digitos)
-        eje_x.append(ib)
-        eje_y1[i]=((eje_y1[i]*eje_y1[i].conjugate())**0.5).real
+    psi = ve.aVector(qubit)
+    eje_x = list(ix.etiquetas(digitos))     # códigos binarios ('000...' a '111...')
+    eje_y1 = np.abs(psi)                    # módulo de las amplitudes
+    eje_y2 = ve.probabilidades(psi)
+    eje_y3 = np.degrees(np.angle(psi))      # fases en grados
 
     fig, (w1, w2, w3) = plt.subplots(3,1)  #Figura con 3 gráficos en 3 filas 1 columna
     fig.suptitle("Vector de estado del qubit")
@@ -292,23 +369,25 @@ def graficar(qubit):   #Grafica qubit (amplitudes vector de estado y probas)
     return
 
 def deutsch(Uf, q1=ket0, q2=ket1):  #Algoritmo de DEUTSCH (debe ser q12=ket01)
-    q12=tensorial(q1, q2)   #Uf = oraculo booleano U00, U01, U10 o U11
+    q12=tensorial(q1, q2)   #Uf = oraculo booleano U00, U01, U10 o U11 (o O00, O01, O10, O11)
     H2=tensorial(H, H)
     HI=tensorial(H, I)
-    vermatrizf(multiplicar(HI, multiplicar(Uf, multiplicar(H2,q12))))
+    vermatrizf(multiplicar(HI, operar(Uf, multiplicar(H2,q12))))
     return
 
 def djozsa(Ufn):  #Algoritmo de DEUTSCH-JOSZA de n entradas (n + ket1 auxiliar)
                 #Ufn = matriz 2^(n+1)*2^(n+1) (oraculo función booleana de n entradas)
-    if (len(Ufn)==len(Ufn[0])):
+                #      o Permutacion armada con oraculo(f, n)
+    if isinstance(Ufn, Permutacion) or (len(Ufn)==len(Ufn[0])):
         q = ket1
         Hn = H
-        n = int(math.log2(len(Ufn)))-1
+        dimension = Ufn.dimension if isinstance(Ufn, Permutacion) else len(Ufn)
+        n = int(math.log2(dimension))-1
         for i in range(n):   # CUIDADO! se trabaja con matrices de 2^(n+1)*2^(n+1)
             q = tensorial(ket0, q)
             HmI = tensorial(Hn, I)  # HmI = Hn ant x I
             Hn = tensorial(H, Hn)   # H x Hn ant
-        vermatrizf(multiplicar(HmI, multiplicar(Ufn, multiplicar(Hn,q))))
+        vermatrizf(multiplicar(HmI, operar(Ufn, multiplicar(Hn,q))))
         return
     else:
         return(0)
@@ -316,11 +395,5 @@ def djozsa(Ufn):  #Algoritmo de DEUTSCH-JOSZA de n entradas (n + ket1 auxiliar)
 def groverUs(n_qubits):         #Arma la compuerta Us = 2|s><s|-I (Difusor de Grover)
     if(n_qubits < 2):           #para un sistema de n_qubits (N=2**n_qubits estados)
         return(0)               #mínimo 2 qubits (sino retorna 0)
-    In = I                      #Matriz Identidad
-    supn = h(ket0)              #Superposición |+>
-    for n in range (n_qubits - 1):
-        In = tensorial(I, In)           #Matriz Identidad N x N
-        supn = tensorial(supn, h(ket0)) #Estado de superposición |+> de n_qubits
-    Usn = sumar(escalar(multiplicar(supn,conjugar(trasponer(supn))),2),escalar(In, -1))
-    return(Usn)
-
+    return(Difusor(n_qubits).matriz())  #2/N en cada entrada menos la identidad, sin productos de matrices
+                                        #usar Difusor(n_qubits) con operar() para no armar la matriz
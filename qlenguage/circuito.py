@@ -0,0 +1,219 @@
+#Circuito: construcción diferida de programas con fusión de compuertas
+#En lugar de aplicar cada compuerta apenas se llama (una pasada sobre el vector
+#de estado por compuerta), Circuito registra las compuertas y al ejecutar arma
+#un programa reducido:
+# - las compuertas de 1 qubit consecutivas sobre el mismo qubit se multiplican
+#   en una sola matriz de 2x2 (una pasada en lugar de varias)
+# - las compuertas diagonales (Z, S, T, P, CZ, oráculos de fase...) conmutan
+#   entre sí, así que las consecutivas se juntan en un único vector de fases
+#   que se aplica con una sola multiplicación elemento a elemento. El vector
+#   sólo abarca los qubits donde actúan (hasta FASES_QUBITS, si no se arma un
+#   segmento nuevo) y se expande sobre el vector de estado al ejecutar
+#El programa compilado se guarda y se reutiliza en cada ejecución.
+#
+#Uso:
+#   c = Circuito(3).h(0).cx(0, 1).cx(1, 2).t(2).z(2)
+#   v = c.ejecutar()          # vector columna ndarray, desde |000>
+#   c.conteos(1000)           # {'000': 503, '111': 497}
+#
+#Convención de qubits igual a Q_Lenguaje: el qubit 0 es el bit más significativo.
+
+import math
+
+import numpy as np
+
+from qlenguage import vectorestado as ve
+from qlenguage import indices as ix
+from qlenguage.permutaciones import mcx
+from qlenguage.grover import OraculoFase
+
+#Máxima cantidad de qubits de un segmento de fases fusionado (2^12 fases, 64 KB)
+FASES_QUBITS = 12
+
+_I = np.eye(2, dtype=np.complex128)
+_H = np.array([[1, 1], [1, -1]], dtype=np.complex128) / math.sqrt(2)
+_X = np.array([[0, 1], [1, 0]], dtype=np.complex128)
+_Y = np.array([[0, -1j], [1j, 0]], dtype=np.complex128)
+
+#Compuerta de fase diag(1, e^(i*radianes))
+def _fase(radianes):
+    return(np.diag([1, np.exp(1j * radianes)]).astype(np.complex128))
+
+def _esDiagonal(U):
+    return(not np.any(U - np.diag(np.diagonal(U))))
+
+#Expande la diagonal de una compuerta sobre qubits a la diagonal sobre soporte
+#(lista de qubits que los incluye, el primero es el más significativo)
+def _expandir(diagonal, qubits, soporte):
+    if list(qubits) == list(soporte):
+        return(diagonal)
+    return(diagonal[ix.resultados(len(soporte), [soporte.index(q) for q in qubits])])
+
+########################
+class Circuito:
+    def __init__(self, cantqubits):
+        self.cantqubits = cantqubits
+        self.dimension = 1 << cantqubits
+        self.compuertas = []        #registro de compuertas en orden: (tipo, operador, qubits)
+        self._programa = None       #programa fusionado (se arma al ejecutar)
+
+    def _agregar(self, tipo, operador, qubits):
+        qubits = tuple(qubits)
+        ve.validarQubits(self.cantqubits, qubits)
+        self.compuertas.append((tipo, operador, qubits))
+        self._programa = None
+        return(self)
+
+    ## Compuertas (retornan el circuito para encadenar llamadas) ##
+
+    #Compuerta U arbitraria (2^k x 2^k) sobre k qubits (el primero es el más significativo)
+    def u(self, U, *qubits):
+        U = np.asarray(U, dtype=np.complex128)
+        if U.shape != (1 << len(qubits), 1 << len(qubits)):
+            raise ValueError("la compuerta no corresponde a la cantidad de qubits")
+        if len(qubits) == 1:
+            return(self._agregar('1q', U, qubits))
+        if _esDiagonal(U):
+            return(self._agregar('diag', np.diagonal(U).copy(), qubits))
+        return(self._agregar('kq', U, qubits))
+
+    def h(self, q):
+        return(self.u(_H, q))
+
+    def x(self, q):
+        return(self.u(_X, q))
+
+    def y(self, q):
+        return(self.u(_Y, q))
+
+    def z(self, q):
+        return(self.u(_fase(math.pi), q))
+
+    def s(self, q):
+        return(self.u(_fase(math.pi / 2), q))
+
+    def sdg(self, q):
+        return(self.u(_fase(-math.pi / 2), q))
+
+    def t(self, q):
+        return(self.u(_fase(math.pi / 4), q))
+
+    def tdg(self, q):
+        return(self.u(_fase(-math.pi / 4), q))
+
+    def p(self, radianes, q):
+        return(self.u(_fase(radianes), q))
+
+    def cx(self, control, target):
+        return(self._agregar('op', mcx(self.cantqubits, [control], target), (control, target)))
+
+    def toffoli(self, control1, control2, target):
+        return(self._agregar('op', mcx(self.cantqubits, [control1, control2], target), (control1, control2, target)))
+
+    def cz(self, q0, q1):
+        return(self._agregar('diag', np.array([1, 1, 1, -1], dtype=np.complex128), (q0, q1)))
+
+    def cp(self, radianes, q0, q1):
+        return(self._agregar('diag', np.array([1, 1, 1, np.exp(1j * radianes)]), (q0, q1)))
+
+    #Operador sobre todos los qubits con aplicarVector(psi): Permutacion, Difusor, OraculoFase...
+    #Los oráculos de fase se fusionan con las demás compuertas diagonales si el
+    #vector de fases completo no supera FASES_QUBITS; si no se aplican directamente
+    def operador(self, U):
+        if isinstance(U, OraculoFase) and self.cantqubits <= FASES_QUBITS:
+            fases = np.ones(self.dimension, dtype=np.complex128)
+            fases[U.marcados] = -1
+            return(self._agregar('diag', fases, range(self.cantqubits)))
+        return(self._agregar('op', U, range(self.cantqubits)))
+
+    ## Compilación ##
+
+    #Arma el programa fusionado: lista de ('1q', U, q), ('diag', fases, soporte), ('kq', U, qubits)
+    #u ('op', operador). fases tiene largo 2^len(soporte), con soporte en orden creciente
+    def compilar(self):
+        if self._programa is not None:
+            return(self._programa)
+        programa = []
+        pendientes = {}         #qubit -> matriz 2x2 acumulada, todavía sin emitir
+        fases = None            #vector de fases acumulado sobre soporte, todavía sin emitir
+        soporte = set()         #qubits sobre los que actúan las fases acumuladas
+
+        def emitirQubit(q):
+            U = pendientes.pop(q, None)
+            if U is not None and not np.allclose(U, _I):
+                programa.append(('1q', U, q))
+
+        def emitirFases():
+            nonlocal fases
+            if fases is not None and not np.allclose(fases, 1):
+                programa.append(('diag', fases, tuple(sorted(soporte))))
+            fases = None
+            soporte.clear()
+
+        for tipo, operador, qubits in self.compuertas:
+            if tipo == '1q':
+                q = qubits[0]
+                if q in pendientes:                 #se fusiona con las compuertas anteriores del qubit
+                    pendientes[q] = operador @ pendientes[q]
+                    continue
+                if _esDiagonal(operador):           #se junta con las demás fases
+                    tipo, operador = 'diag', np.diagonal(operador).copy()
+                else:
+                    if q in soporte:                #no conmuta con las fases acumuladas
+                        emitirFases()
+                    pendientes[q] = operador
+                    continue
+            if tipo == 'diag':
+                for q in qubits:                    #las pendientes de estos qubits van antes
+                    emitirQubit(q)
+                union = soporte.union(qubits)
+                if fases is not None and len(union) > FASES_QUBITS:
+                    emitirFases()                   #segmento completo: empieza otro
+                    union = set(qubits)
+                nuevo = sorted(union)
+                nuevas = _expandir(operador, qubits, nuevo)
+                fases = nuevas if fases is None else _expandir(fases, sorted(soporte), nuevo) * nuevas
+                soporte.update(qubits)
+                continue
+            #compuerta no diagonal de varios qubits: emite lo pendiente que no conmuta con ella
+            for q in qubits:
+                emitirQubit(q)
+            if soporte.intersection(qubits):
+                emitirFases()
+            programa.append((tipo, operador, qubits) if tipo == 'kq' else ('op', operador))
+
+        #lo que queda pendiente conmuta entre sí (qubits distintos, fuera del soporte de las fases)
+        emitirFases()
+        for q in sorted(pendientes):
+            emitirQubit(q)
+        self._programa = programa
+        return(programa)
+
+    ## Ejecución ##
+
+    #Ejecuta el programa fusionado sobre vector (|00...0> si no se indica)
+    #Retorna el vector de estado en el formato de vector (vector columna ndarray si no se indica)
+    def ejecutar(self, vector=None):
+        psi = ve.ceros(self.cantqubits) if vector is None else ve.aVector(vector)
+        if len(psi) != self.dimension:
+            raise ValueError("el vector no corresponde a la cantidad de qubits del circuito")
+        for paso in self.compilar():
+            if paso[0] == '1q':
+                ve.aplicar1q(psi, paso[1], paso[2])
+            elif paso[0] == 'diag':
+                ve.aplicarDiagonal(psi, paso[1], paso[2])
+            elif paso[0] == 'kq':
+                ve.aplicar(psi, paso[1], paso[2])
+            else:
+                paso[1].aplicarVector(psi)
+        if vector is None:
+            return(psi.reshape(-1, 1))
+        return(ve.aColumna(psi, vector))
+
+    #Ejecuta y mide tiros veces; retorna diccionario {'0101': cantidad, ...}
+    def conteos(self, tiros, vector=None, semilla=None):
+        return(ve.muestrear(ve.aVector(self.ejecutar(vector)), tiros, semilla))
+
+    #Cantidad de compuertas registradas y de pasos del programa fusionado
+    def resumen(self):
+        return({'compuertas': len(self.compuertas), 'pasos': len(self.compilar())})
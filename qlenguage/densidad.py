@@ -0,0 +1,174 @@
+#Simulación con matrices de densidad y canales de Kraus (ruido)
+#Un estado mixto de n qubits es una matriz rho de 2^n x 2^n (ndarray complex128).
+#Los canales se aplican localmente: rho se ve como un tensor de 2n ejes de
+#tamaño 2 (n ejes de filas y n de columnas) y cada operador de Kraus K actúa
+#sólo sobre el eje del qubit en las filas y su conjugado sobre el mismo qubit
+#en las columnas, rho' = suma K rho K^daga, en O(4^n) por operador en lugar de
+#armar superoperadores de 4^n x 4^n.
+#
+#Convención de qubits igual a Q_Lenguaje: el qubit 0 es el bit más significativo.
+#Las funciones retornan una matriz nueva (no modifican rho).
+
+import numpy as np
+
+from qlenguage import vectorestado as ve
+from qlenguage import indices as ix
+
+########################
+#Cantidad de qubits de una matriz densidad rho de 2^n x 2^n
+def cantQubits(rho):
+    if rho.ndim != 2 or rho.shape[0] != rho.shape[1]:
+        raise ValueError("la matriz densidad debe ser cuadrada")
+    return(ve.cantQubits(rho[0]))
+
+#Matriz densidad |psi><psi| de un vector de estado (columna o 1D)
+def densidad(vector):
+    psi = ve.aVector(vector)
+    return(np.outer(psi, np.conj(psi)))
+
+#Estado |00...0><00...0| de n qubits
+def ceros(cantqubits):
+    rho = np.zeros((1 << cantqubits, 1 << cantqubits), dtype=np.complex128)
+    rho[0, 0] = 1
+    return(rho)
+
+#Aplica U (2^k x 2^k) a los ejes indicados del tensor T (el primero es el más significativo)
+def _aplicarEjes(T, U, ejes):
+    k = len(ejes)
+    if k == 1:      #un solo eje: vista por saltos [ejes a la izq, eje, ejes a la der] como en vectorestado.aplicar1q
+        v = np.ascontiguousarray(T).reshape(1 << ejes[0], 2, -1)
+        if v.shape[2] >= 16:    #saltos largos: un producto de matrices por bloque
+            return(np.matmul(U, v).reshape(T.shape))
+        R = np.empty_like(v)    #saltos cortos (ejes finales): combinación elemento a elemento
+        R[:, 0, :] = U[0, 0] * v[:, 0, :] + U[0, 1] * v[:, 1, :]
+        R[:, 1, :] = U[1, 0] * v[:, 0, :] + U[1, 1] * v[:, 1, :]
+        return(R.reshape(T.shape))
+    sub = np.moveaxis(T, ejes, range(k))
+    nuevo = (U @ sub.reshape(1 << k, -1)).reshape(sub.shape)
+    return(np.moveaxis(nuevo, range(k), ejes))
+
+#Aplica el canal con operadores de Kraus [K0, K1, ...] (cada uno 2^k x 2^k)
+#a los k qubits indicados: rho' = suma Ki rho Ki^daga
+def aplicarKraus(rho, kraus, qubits):
+    qubits = list(qubits)
+    n = cantQubits(rho)
+    k = len(qubits)
+    ve.validarQubits(n, qubits)
+    T = np.asarray(rho, dtype=np.complex128).reshape((2,) * (2 * n))
+    filas = qubits
+    columnas = [n + q for q in qubits]
+    R = np.zeros_like(T)
+    for K in kraus:
+        K = np.asarray(K, dtype=np.complex128)
+        if K.shape != (1 << k, 1 << k):
+            raise ValueError("el operador de Kraus no corresponde a la cantidad de qubits")
+        R += _aplicarEjes(_aplicarEjes(T, K, filas), np.conj(K), columnas)
+    return(R.reshape(1 << n, 1 << n))
+
+#Aplica una compuerta unitaria U a los qubits indicados: rho' = U rho U^daga
+def aplicar(rho, U, qubits):
+    return(aplicarKraus(rho, [U], qubits))
+
+#True si los operadores de Kraus preservan la traza (suma Ki^daga Ki = I)
+def esCanal(kraus, tol=1e-9):
+    suma = sum(np.conj(np.asarray(K)).T @ np.asarray(K) for K in kraus)
+    return(bool(np.allclose(suma, np.eye(len(suma)), rtol=0, atol=tol)))
+
+## Canales de 1 qubit (listas de operadores de Kraus) ##
+
+#Despolarizante: con probabilidad p el qubit queda totalmente mezclado
+def depolarizante(p):
+    if not 0 <= p <= 1:
+        raise ValueError("p debe estar entre 0 y 1")
+    I = np.eye(2)
+    X = np.array([[0, 1], [1, 0]])
+    Y = np.array([[0, -1j], [1j, 0]])
+    Z = np.array([[1, 0], [0, -1]])
+    return([np.sqrt(1 - 3 * p / 4) * I] + [np.sqrt(p / 4) * P for P in (X, Y, Z)])
+
+#Amortiguamiento de amplitud: |1> decae a |0> con probabilidad gamma (relajación T1)
+def amortiguamiento(gamma):
+    if not 0 <= gamma <= 1:
+        raise ValueError("gamma debe estar entre 0 y 1")
+    return([np.array([[1, 0], [0, np.sqrt(1 - gamma)]]),
+            np.array([[0, np.sqrt(gamma)], [0, 0]])])
+
+#Reset: lleva el qubit a |0> cualquiera sea su estado (irreversible, vale para estados mixtos)
+def canalReset():
+    return([np.array([[1, 0], [0, 0]]), np.array([[0, 1], [0, 0]])])
+
+#Aplica un canal de 1 qubit a cada uno de los qubits indicados
+def aplicarCanal(rho, kraus, qubits):
+    for q in qubits:
+        rho = aplicarKraus(rho, kraus, [q])
+    return(rho)
+
+#Despolarizante sobre cada qubit indicado, sin pasar por los 4 operadores de Kraus:
+# rho' = (1-p) rho + p * (Tr_q rho) x I/2
+def depolarizar(rho, p, qubits):
+    if not 0 <= p <= 1:
+        raise ValueError("p debe estar entre 0 y 1")
+    n = cantQubits(rho)
+    for q in qubits:
+        ve.validarQubits(n, [q])
+        a = 1 << q
+        b = 1 << (n - q - 1)
+        v = np.asarray(rho, dtype=np.complex128).reshape(a, 2, b, a, 2, b)
+        traza = v[:, 0, :, :, 0, :] + v[:, 1, :, :, 1, :]     #traza parcial sobre el qubit q
+        R = (1 - p) * v
+        R[:, 0, :, :, 0, :] += (p / 2) * traza
+        R[:, 1, :, :, 1, :] += (p / 2) * traza
+        rho = R.reshape(1 << n, 1 << n)
+    return(rho)
+
+def amortiguar(rho, gamma, qubits):
+    return(aplicarCanal(rho, amortiguamiento(gamma), qubits))
+
+def reset(rho, qubitNro):
+    return(aplicarKraus(rho, canalReset(), [qubitNro]))
+
+## Medición ##
+
+#Probabilidades de cada estado de la base (diagonal de rho)
+def probabilidades(rho):
+    return(np.clip(np.real(np.diagonal(rho)), 0, None))
+
+#Pureza Tr(rho^2): 1 para estados puros, 1/2^n para el estado totalmente mezclado
+def pureza(rho):
+    return(float(np.real(np.vdot(rho, rho))))
+
+#Aplica error de lectura a una distribución de probabilidades de n qubits
+# p01 = probabilidad de leer 1 cuando el qubit es 0, p10 = de leer 0 cuando es 1
+# (iguales para todos los qubits); cada qubit se trata por separado con su
+# matriz de confusión de 2x2, sin armar la de 2^n x 2^n
+def errorLectura(probas, p01, p10):
+    n = ve.cantQubits(probas)
+    confusion = np.array([[1 - p01, p10], [p01, 1 - p10]])
+    T = np.asarray(probas, dtype=np.float64).reshape((2,) * n)
+    for q in range(n):
+        T = _aplicarEjes(T, confusion, [q])
+    return(T.reshape(-1))
+
+#Cantidad de veces que se lee cada estado al medir rho tiros veces, con error de lectura opcional
+#Retorna diccionario {'0101': cantidad, ...} con sólo los estados que aparecieron
+def muestrear(rho, tiros, semilla=None, p01=0.0, p10=0.0):
+    n = cantQubits(rho)
+    p = probabilidades(rho)
+    if p01 or p10:
+        p = errorLectura(p, p01, p10)
+    cuentas = ve.generador(semilla).multinomial(tiros, p / p.sum())
+    return({ix.etiquetas(n)[i]: int(cuentas[i]) for i in np.flatnonzero(cuentas)})
+
+#Mide los qubits indicados (medición proyectiva parcial)
+#Retorna (bits medidos, rho resultante normalizada)
+def medirQubits(rho, qubits, semilla=None):
+    n = cantQubits(rho)
+    qubits = list(qubits)
+    ve.validarQubits(n, qubits)
+    r = ix.resultados(n, qubits)
+    marginal = np.bincount(r, weights=probabilidades(rho), minlength=1 << len(qubits))
+    m = int(ve.generador(semilla).choice(len(marginal), p=marginal / marginal.sum()))
+    conserva = r == m
+    R = np.where(np.outer(conserva, conserva), rho, 0) / marginal[m]
+    bits = [(m >> (len(qubits) - 1 - k)) & 1 for k in range(len(qubits))]
+    return(bits, R)
@@ -0,0 +1,103 @@
+#Algoritmo de Grover con operadores implícitos
+#El difusor Us = 2|s><s| - I y el oráculo de fase no se arman como matrices
+#de N x N (N = 2^n): se aplican directamente al vector de estado en O(N).
+# - Difusor: "reflexión respecto de la media", psi -> 2*promedio(psi) - psi
+# - OraculoFase: invierte el signo de las amplitudes de los estados marcados
+#
+#Convención de qubits igual a Q_Lenguaje: el qubit 0 es el bit más significativo
+#(el estado '101' es el índice 5).
+
+import math
+
+import numpy as np
+
+from qlenguage import vectorestado as ve
+
+########################
+#Operador de difusión de Grover Us = 2|s><s| - I sobre n qubits
+class Difusor:
+    def __init__(self, cantqubits):
+        self.cantqubits = cantqubits
+        self.dimension = 1 << cantqubits
+
+    #Aplica el difusor a psi (ndarray 1D) en el lugar
+    def aplicarVector(self, psi):
+        promedio = psi.mean()
+        np.subtract(2 * promedio, psi, out=psi)     #2*promedio - psi sin vectores temporales
+        return(psi)
+
+    #Aplica el difusor a un vector columna (lista o ndarray); retorna el mismo formato
+    def aplicar(self, vector):
+        if (len(vector[0]) != 1 or len(vector) != self.dimension):
+            return(0)
+        return(ve.aColumna(self.aplicarVector(ve.aVector(vector)), vector, float))
+
+    #Matriz densa equivalente como lista de listas (2/N en todas las entradas, 2/N - 1 en la diagonal)
+    def matriz(self):
+        R = np.full((self.dimension, self.dimension), 2 / self.dimension)
+        R[np.diag_indices(self.dimension)] -= 1
+        return(R.tolist())
+
+#Oráculo de fase Uf|x> = (-1)^f(x) |x> que marca los estados indicados
+# marcados: índices enteros o códigos binarios ('101'); ver también desdeFuncion()
+class OraculoFase:
+    def __init__(self, cantqubits, marcados):
+        self.cantqubits = cantqubits
+        self.dimension = 1 << cantqubits
+        indices = [int(m, 2) if isinstance(m, str) else int(m) for m in marcados]
+        if not all(0 <= i < self.dimension for i in indices):
+            raise ValueError("estado marcado fuera de rango")
+        self.marcados = np.unique(np.asarray(indices, dtype=np.intp))
+
+    #Oráculo de la función booleana f, evaluada sobre el índice de cada estado
+    #(f debe aceptar un ndarray de índices y retornar un ndarray de booleanos)
+    @classmethod
+    def desdeFuncion(cls, cantqubits, f):
+        return(cls(cantqubits, np.flatnonzero(f(np.arange(1 << cantqubits)))))
+
+    #Aplica el oráculo a psi (ndarray 1D) en el lugar
+    def aplicarVector(self, psi):
+        psi[self.marcados] *= -1
+        return(psi)
+
+    #Aplica el oráculo a un vector columna (lista o ndarray); retorna el mismo formato
+    def aplicar(self, vector):
+        if (len(vector[0]) != 1 or len(vector) != self.dimension):
+            return(0)
+        return(ve.aColumna(self.aplicarVector(ve.aVector(vector)), vector))
+
+    #Matriz densa equivalente como lista de listas (diagonal de 1 y -1)
+    def matriz(self):
+        d = np.ones(self.dimension, dtype=np.int64)
+        d[self.marcados] = -1
+        return(np.diag(d).tolist())
+
+#Cantidad óptima de iteraciones de Grover para M estados marcados entre N: piso(pi/4 * raiz(N/M))
+def iteracionesOptimas(dimension, cantmarcados):
+    if cantmarcados < 1 or cantmarcados > dimension:
+        return(0)
+    return(int(math.floor(math.pi / 4 * math.sqrt(dimension / cantmarcados))))
+
+#Ejecuta Grover sobre n qubits: superposición uniforme y luego iteraciones de oráculo + difusor
+# oraculo: OraculoFase o lista de estados marcados
+# iteraciones: None usa la cantidad óptima
+#Retorna psi final (ndarray 1D complex128)
+def grover(cantqubits, oraculo, iteraciones=None):
+    if not isinstance(oraculo, OraculoFase):
+        oraculo = OraculoFase(cantqubits, oraculo)
+    difusor = Difusor(cantqubits)
+    if iteraciones is None:
+        iteraciones = iteracionesOptimas(difusor.dimension, len(oraculo.marcados))
+    psi = np.full(difusor.dimension, 1 / math.sqrt(difusor.dimension), dtype=np.complex128)   #H^n |0...0>
+    for _ in range(iteraciones):
+        oraculo.aplicarVector(psi)
+        difusor.aplicarVector(psi)
+    return(psi)
+
+#Ejecuta Grover y mide tiros veces; retorna diccionario {'0101': cantidad, ...}
+def buscar(cantqubits, oraculo, tiros=1024, iteraciones=None, semilla=None):
+    return(ve.muestrear(grover(cantqubits, oraculo, iteraciones), tiros, semilla))
+
+#Probabilidad de medir alguno de los estados marcados en psi
+def probabilidadExito(psi, oraculo):
+    return(float(ve.probabilidades(psi)[oraculo.marcados].sum()))
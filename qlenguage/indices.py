@@ -0,0 +1,77 @@
+#Indexación de los estados de la base por bits
+#Para saber en qué estado está el qubit k del estado de la base i basta con
+#una máscara de bits: (i >> (n-1-k)) & 1. Las tablas de índices se calculan
+#una sola vez por cantidad de qubits (lru_cache) y se usan como máscaras de
+#NumPy, en lugar de armar format(i,"b") y evaluar cada caracter.
+#
+#Convención de qubits igual a Q_Lenguaje: el qubit 0 es el bit más significativo.
+#Las tablas retornadas son de sólo lectura (se comparten entre llamadas).
+#Sólo se guardan las tablas de hasta CACHE_QUBITS qubits, y pocas por función:
+#las de un estado grande (2^26 índices ocupan 512 MB) se recalculan en cada
+#llamada en lugar de quedar retenidas mientras dure el proceso.
+
+from functools import lru_cache, wraps
+
+import numpy as np
+
+CACHE_QUBITS = 20
+
+########################
+#Máscara del bit que corresponde a qubitNro en un sistema de cantqubits
+def mascara(cantqubits, qubitNro):
+    return(1 << (cantqubits - 1 - qubitNro))
+
+#Máscara con los bits de todos los qubits indicados
+def mascaras(cantqubits, qubits):
+    m = 0
+    for q in qubits:
+        m |= mascara(cantqubits, q)
+    return(m)
+
+def _soloLectura(A):
+    A.flags.writeable = False
+    return(A)
+
+#Guarda en caché (lru_cache de maxsize entradas) sólo las tablas de hasta CACHE_QUBITS qubits
+def _tabla(maxsize):
+    def decorador(f):
+        cacheada = lru_cache(maxsize=maxsize)(f)
+        @wraps(f)
+        def tabla(cantqubits, *args):
+            if cantqubits > CACHE_QUBITS:
+                return(f(cantqubits, *args))
+            return(cacheada(cantqubits, *args))
+        tabla.cache_clear = cacheada.cache_clear
+        tabla.cache_info = cacheada.cache_info
+        return(tabla)
+    return(decorador)
+
+#Índices 0 .. 2^cantqubits - 1 de los estados de la base
+@_tabla(maxsize=4)
+def indices(cantqubits):
+    return(_soloLectura(np.arange(1 << cantqubits, dtype=np.intp)))
+
+#Valor (0 o 1) del qubitNro en cada estado de la base
+@_tabla(maxsize=32)
+def bits(cantqubits, qubitNro):
+    if not 0 <= qubitNro < cantqubits:
+        raise ValueError("qubit fuera de rango")
+    return(_soloLectura(((indices(cantqubits) >> (cantqubits - 1 - qubitNro)) & 1).astype(np.uint8)))
+
+#Máscara booleana de los estados de la base donde qubitNro vale valor
+@_tabla(maxsize=32)
+def seleccion(cantqubits, qubitNro, valor):
+    return(_soloLectura(bits(cantqubits, qubitNro) == valor))
+
+#Resultado de medir los qubits indicados en cada estado de la base, como entero
+#(el primer qubit de la lista es el bit más significativo del resultado)
+def resultados(cantqubits, qubits):
+    r = np.zeros(1 << cantqubits, dtype=np.intp)
+    for q in qubits:
+        r = (r << 1) | bits(cantqubits, q)
+    return(r)
+
+#Etiquetas binarias de los estados de la base ('00', '01', '10', '11')
+@_tabla(maxsize=4)
+def etiquetas(cantqubits):
+    return(tuple(np.binary_repr(i, width=cantqubits) for i in range(1 << cantqubits)))
@@ -1,7 +1,12 @@
 #Operaciones con matrices
 #Enrique Cingolani - 27/07/2019-26/03/2022
+#18/10/26 determinante() e inversa() por descomposición LU; agregadas resolver(), daga(), esunitaria()
+#18/10/26 leer() usa ast.literal_eval en lugar de eval
+#18/10/26 determinante() exacto para matrices enteras (Bareiss); singularidad con tolerancia relativa a las entradas
 #Importarlo como un modulo con: from matrices import *
 
+import ast
+
 ########################
 #Traspone una matriz Mt
 def trasponer(M):
@@ -37,34 +42,126 @@ def menor(M,i,j):
     else:
         return(1) # si tiene una sola fila retorna 1 (sirve para determinante)
 
-#Determinante de una matriz M                             
+#Descomposición LU con pivoteo parcial de una matriz cuadrada M: P*M = L*U
+# retorna (LU, piv, signo): L (diagonal 1, no se guarda) y U juntas en LU,
+# piv[i] = fila de M que quedó en la fila i, signo = (-1)^(cant intercambios)
+# retorna 0 si M no es cuadrada
+def descomponerLU(M):
+    n = len(M)
+    if n != len(M[0]):
+        return(0)
+    tol = tolerancia(M)
+    LU = [list(fila) for fila in M]
+    piv = list(range(n))
+    signo = 1
+    for k in range (n):
+        p = max(range(k, n), key=lambda i: abs(LU[i][k])) #fila con mayor pivote
+        if p != k:
+            LU[k], LU[p] = LU[p], LU[k]
+            piv[k], piv[p] = piv[p], piv[k]
+            signo = -signo
+        if abs(LU[k][k]) <= tol:    #columna nula: matriz singular
+            continue
+        for i in range (k+1, n):
+            f = LU[i][k] / LU[k][k]
+            LU[i][k] = f
+            for j in range (k+1, n):
+                LU[i][j] -= f * LU[k][j]
+    return(LU, piv, signo)
+
+#Pivote por debajo del cual M se considera singular: relativo al tamaño de sus
+# entradas (n * épsilon de máquina * mayor entrada), así una matriz de entradas
+# chicas pero bien condicionada no se confunde con una singular
+def tolerancia(M):
+    escala = max(abs(x) for fila in M for x in fila)
+    return(len(M) * 2.220446049250313e-16 * escala)
+
+#Determinante exacto de una matriz de enteros (eliminación de Bareiss: todas las
+# divisiones son exactas, así que no hay redondeo y el resultado es entero)
+def determinanteEntero(M):
+    A = [list(fila) for fila in M]
+    n = len(A)
+    signo = 1
+    anterior = 1
+    for k in range (n-1):
+        if A[k][k] == 0:
+            p = next((i for i in range(k+1, n) if A[i][k] != 0), None)
+            if p is None:
+                return(0)
+            A[k], A[p] = A[p], A[k]
+            signo = -signo
+        for i in range (k+1, n):
+            for j in range (k+1, n):
+                A[i][j] = (A[i][j] * A[k][k] - A[i][k] * A[k][j]) // anterior
+        anterior = A[k][k]
+    return(signo * A[n-1][n-1])
+
+#Determinante de una matriz M (producto de la diagonal de U, O(n^3))
+# si todas las entradas son enteras el resultado es entero y exacto
 def determinante(M):
     if len(M)==len(M[0]): #Deben ser de igual cant filas y col
-        d = M[0][0]
-        if (len(M[0])) > 1:
-            d = 0
-            for j in range (len(M[0])):
-                signo=(-1)**(j)
-                d += M[0][j]*signo * determinante(menor(M,0,j))
+        if all(isinstance(x, int) for fila in M for x in fila):
+            return(determinanteEntero(M))
+        LU, piv, signo = descomponerLU(M)
+        d = signo
+        for i in range (len(LU)):
+            d *= LU[i][i]
         return(d)
     else:
         return(0)
 
+#Resuelve el sistema M*X = B por LU (B puede tener varias columnas)
+# retorna 0 si M no es cuadrada, es singular o B no tiene len(M) filas
+def resolver(M, B):
+    n = len(M)
+    if n != len(M[0]) or n != len(B):
+        return(0)
+    LU, piv, signo = descomponerLU(M)
+    tol = tolerancia(M)
+    for i in range (n):
+        if abs(LU[i][i]) <= tol:
+            return(0)
+    X = []
+    for c in range (len(B[0])):
+        y = [B[piv[i]][c] for i in range (n)]
+        for i in range (n):             #sustitución hacia adelante (L)
+            for j in range (i):
+                y[i] -= LU[i][j] * y[j]
+        for i in range (n-1, -1, -1):   #sustitución hacia atrás (U)
+            for j in range (i+1, n):
+                y[i] -= LU[i][j] * y[j]
+            y[i] = y[i] / LU[i][i]
+        X.append(y)
+    return(trasponer(X))
+
+#Traspuesta conjugada (adjunta hermítica, "daga") de una matriz M
+def daga(M):
+    return(conjugar(trasponer(M)))
+
+#True si M es unitaria (M * M daga = I, con tolerancia tol)
+def esunitaria(M, tol=1e-9):
+    n = len(M)
+    if n != len(M[0]):
+        return(False)
+    for i in range (n):
+        for j in range (n):
+            p = 0
+            for k in range (n):
+                p += M[i][k] * M[j][k].conjugate()
+            if abs(p - (1 if i == j else 0)) > tol:
+                return(False)
+    return(True)
+
 #Inversa de una matriz M
-# calcula M^-1 = (1/determinante(M))*((M adjunta)traspuesta)
+# si M es unitaria la inversa es su traspuesta conjugada (sin resolver nada),
+# si no, resuelve M*X = I por LU. Retorna 0 si M es singular
 def inversa(M):
-    d = determinante(M)
-    if d != 0:
-        R=[]
-        for i in range (len(M)):
-            R.append([])
-            for j in range (len(M[0])):
-                signo=(-1)**(i+j)
-                R[i].append(signo * determinante(menor(M,i,j)) / d)
-        R = trasponer(R)        
-        return(R)
-    else:
+    if len(M) != len(M[0]):
         return(0)
+    if esunitaria(M):
+        return(daga(M))
+    In = [[1 if i == j else 0 for j in range (len(M))] for i in range (len(M))]
+    return(resolver(M, In))
 
 #Multiplica una matriz por un escalar M*a
 def escalar(M, a):
@@ -172,10 +269,11 @@ def guardar(matriz, archivo):
     return
 
 #Lee una matriz de un archivo en disco
+# usa literal_eval: sólo acepta literales (listas y números), no ejecuta código
 def leer(archivo):
     with open(archivo, 'r') as f:
         matriz_txt=f.read()
-        matriz = eval(matriz_txt)
+        matriz = ast.literal_eval(matriz_txt)
     return(matriz)   
 
 
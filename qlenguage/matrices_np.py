@@ -0,0 +1,282 @@
+#Operaciones con matrices - motor vectorizado con NumPy
+#Mismas funciones que matrices.py, pero cada operación se resuelve con un
+#kernel de NumPy en lugar de lazos anidados en Python.
+#Importarlo como un modulo con: from qlenguage.matrices_np import *
+#
+#Dos modos de uso:
+# - Compatibilidad: si todos los argumentos son listas de listas, el resultado
+#   también es una lista de listas (enteros, reales o complejos de Python),
+#   por lo que el código existente funciona sin cambios.
+# - Nativo: si algún argumento es un ndarray, el resultado es un ndarray y no
+#   se paga la conversión lista <-> array en cada operación. Usar matriz() para
+#   pasar una matriz o vector a complex128 y lista() para volver a listas.
+#
+#guardar() y leer() usan un formato binario (encabezado + datos complex128
+#crudos, el formato .npy de NumPy) y leer() mapea el archivo en memoria, así un
+#vector de estado de 2^26 amplitudes se reabre sin copiarlo.
+
+import numpy as np
+
+from qlenguage import matrices as _m
+from qlenguage.matrices import vermatriz, vermatrizf, ingresar
+
+########################
+#Convierte una matriz M (lista de listas o ndarray) a ndarray complex128
+def matriz(M):
+    return(np.array(M, dtype=np.complex128, ndmin=2))
+
+#Convierte una matriz M (ndarray) a lista de listas
+def lista(M):
+    if isinstance(M, np.ndarray):
+        return(M.tolist())
+    return(M)
+
+#True si alguno de los argumentos es un ndarray (modo nativo)
+def _nativo(*Ms):
+    return(any(isinstance(M, np.ndarray) for M in Ms))
+
+#Devuelve el resultado R en el mismo modo que los argumentos Ms
+def _salida(R, *Ms):
+    if _nativo(*Ms):
+        return(R)
+    return(R.tolist())
+
+#Convierte los argumentos a ndarrays de 2 dimensiones; retorna None si alguno
+#no es una matriz (vector 1D, filas de distinto largo o vacía), para que las
+#funciones retornen 0 como en matrices.py en lugar de lanzar una excepción
+def _arreglos(*Ms):
+    As = []
+    for M in Ms:
+        try:
+            A = np.asarray(M)
+        except ValueError:      #filas de distinto largo
+            return(None)
+        if A.ndim != 2 or A.size == 0:
+            return(None)
+        As.append(A)
+    return(As)
+
+#Mayor valor absoluto de una matriz de enteros, como entero de Python
+def _maximo(A):
+    return(max(abs(int(A.max())), abs(int(A.min()))))
+
+#En modo compatibilidad las matrices de enteros se operan como int64 mientras el
+#resultado no pueda desbordar (cota = mayor valor absoluto posible del resultado);
+#si no, se pasan a enteros de Python (dtype object), sin límite como en matrices.py
+def _sinDesborde(cota, *As):
+    if cota < 2**63:
+        return(As)
+    return(tuple(A.astype(object) for A in As))
+
+#True si hay que cuidar el desborde: modo compatibilidad y todos enteros
+def _enteros(Ms, As):
+    return(not _nativo(*Ms) and all(A.dtype.kind in 'iub' for A in As))
+
+#Las matrices de enteros de Python (dtype object, resultado de operaciones que
+#hubieran desbordado) se pasan a float64 (o complex128) para LAPACK
+def _numerico(A):
+    if A.dtype != object:
+        return(A)
+    try:
+        return(A.astype(np.float64))
+    except TypeError:       #hay complejos
+        return(A.astype(np.complex128))
+
+#Traspone una matriz Mt
+def trasponer(M):
+    As = _arreglos(M)
+    if As is None:
+        return(0)
+    return(_salida(As[0].T, M))
+
+#Complejo conjugado de una matriz M*
+def conjugar(M):
+    As = _arreglos(M)
+    if As is None:
+        return(0)
+    return(_salida(np.conj(As[0]), M))
+
+#Menor i,j de la matriz M
+def menor(M,i,j):
+    As = _arreglos(M)
+    if As is None:
+        return(0)
+    A = As[0]
+    if len(A) > 1:
+        R = np.delete(np.delete(A, i, axis=0), j, axis=1)
+        return(_salida(R, M))
+    else:
+        return(1) # si tiene una sola fila retorna 1 (sirve para determinante)
+
+#Descomposición LU con pivoteo parcial (la de matrices.py, para listas)
+descomponerLU = _m.descomponerLU
+
+#Determinante de una matriz M (LAPACK, por LU)
+# en modo compatibilidad, una matriz de enteros da un entero exacto (como matrices.py)
+def determinante(M):
+    As = _arreglos(M)
+    if As is None:
+        return(0)
+    A = As[0]
+    if A.shape[0] == A.shape[1]: #Deben ser de igual cant filas y col
+        if not _nativo(M) and (A.dtype.kind in 'iub' or all(isinstance(x, int) for x in A.flat)):
+            return(_m.determinanteEntero(A.tolist()))
+        d = np.linalg.det(_numerico(A))
+        return(d if _nativo(M) else d.item())
+    else:
+        return(0)
+
+#Resuelve el sistema M*X = B (LAPACK, por LU); retorna 0 si no tiene solución única
+def resolver(M, B):
+    As = _arreglos(M, B)
+    if As is None:
+        return(0)
+    A, Bv = _numerico(As[0]), _numerico(As[1])
+    if A.shape[0] != A.shape[1] or A.shape[0] != Bv.shape[0]:
+        return(0)
+    try:
+        return(_salida(np.linalg.solve(A, Bv), M, B))
+    except np.linalg.LinAlgError:   #matriz singular
+        return(0)
+
+#Traspuesta conjugada (adjunta hermítica, "daga") de una matriz M
+def daga(M):
+    As = _arreglos(M)
+    if As is None:
+        return(0)
+    return(_salida(np.conj(As[0]).T, M))
+
+#True si M es unitaria (M * M daga = I, con tolerancia tol)
+def esunitaria(M, tol=1e-9):
+    As = _arreglos(M)
+    if As is None or As[0].shape[0] != As[0].shape[1]:
+        return(False)
+    A = _numerico(As[0])
+    return(bool(np.allclose(A @ np.conj(A).T, np.eye(len(A)), rtol=0, atol=tol)))
+
+#Inversa de una matriz M
+# si M es unitaria la inversa es su traspuesta conjugada, si no usa LU
+def inversa(M):
+    As = _arreglos(M)
+    if As is None or As[0].shape[0] != As[0].shape[1]:
+        return(0)
+    A = _numerico(As[0])
+    if esunitaria(A):
+        return(daga(M))
+    try:
+        return(_salida(np.linalg.inv(A), M))
+    except np.linalg.LinAlgError:   #matriz singular
+        return(0)
+
+#Multiplica una matriz por un escalar M*a
+def escalar(M, a):
+    As = _arreglos(M)
+    if As is None:
+        return(0)
+    A = As[0]
+    if _enteros([M], [A]) and isinstance(a, (int, np.integer)):
+        A, = _sinDesborde(_maximo(A) * abs(int(a)), A)
+    return(_salida(A * a, M))
+
+#Suma 2 matrices M+N
+def sumar(M, N):
+    As = _arreglos(M, N)
+    if As is None:
+        return(0)
+    A, B = As
+    if A.shape == B.shape: #Deben ser de igual cant filas y col
+        if _enteros([M, N], As):
+            A, B = _sinDesborde(_maximo(A) + _maximo(B), A, B)
+        return(_salida(A + B, M, N))
+    else:
+        return(0)
+
+#Multiplica 2 matrices M*N
+def multiplicar(M, N):
+    As = _arreglos(M, N)
+    if As is None:
+        return(0)
+    A, B = As
+    if A.shape[1] == B.shape[0]: #Debe ser cantidad de col de M = cant filas de N
+        if _enteros([M, N], As):
+            A, B = _sinDesborde(_maximo(A) * _maximo(B) * A.shape[1], A, B)
+        return(_salida(A @ B, M, N))
+    else:
+        return(0)
+
+#Producto tensorial de 2 matrices MxN
+def tensorial(M, N):
+    As = _arreglos(M, N)
+    if As is None:
+        return(0)
+    A, B = As
+    if _enteros([M, N], As):
+        A, B = _sinDesborde(_maximo(A) * _maximo(B), A, B)
+    return(_salida(np.kron(A, B), M, N))
+
+_MAGICO = np.lib.format.MAGIC_PREFIX   #primeros bytes de un archivo binario
+
+#Guarda una matriz en un archivo binario en disco (encabezado + datos complex128)
+def guardar(matriz, archivo):
+    with open(archivo, 'wb') as f:
+        np.save(f, np.asarray(matriz, dtype=np.complex128))
+    return
+
+#Lee una matriz de un archivo en disco
+# archivo binario: retorna un ndarray mapeado en memoria (sin copiar los datos),
+#   modo 'r' sólo lectura, 'r+' lectura/escritura, 'c' copia al escribir,
+#   None lo carga completo en memoria
+# archivo de texto (guardado con matrices.guardar): retorna la lista de listas
+def leer(archivo, modo='r'):
+    with open(archivo, 'rb') as f:
+        binario = f.read(len(_MAGICO)) == _MAGICO
+    if not binario:
+        return(_m.leer(archivo))
+    return(np.load(archivo, mmap_mode=modo))
+
+#Escribe un vector de estado (o matriz) por bloques, a medida que se genera
+# el archivo se crea con el tamaño final y cada bloque se copia a continuación
+# del anterior, sin tener todo el vector en memoria. Uso:
+#   with EscritorEstado('estado.bin', 2**26) as e:
+#       for bloque in bloques:
+#           e.escribir(bloque)
+class EscritorEstado:
+    def __init__(self, archivo, forma):
+        if isinstance(forma, int):
+            forma = (forma,)
+        self.datos = np.lib.format.open_memmap(archivo, mode='w+', dtype=np.complex128, shape=tuple(forma))
+        self.plano = self.datos.reshape(-1)     #vista 1D para escribir en orden
+        self.posicion = 0
+
+    #Agrega un bloque de amplitudes a continuación de lo ya escrito
+    def escribir(self, bloque):
+        bloque = np.asarray(bloque, dtype=np.complex128).reshape(-1)
+        fin = self.posicion + len(bloque)
+        if fin > len(self.plano):
+            raise ValueError("el bloque excede el tamaño declarado del archivo")
+        self.plano[self.posicion:fin] = bloque
+        self.posicion = fin
+        return
+
+    #Vuelca los datos a disco y cierra el archivo
+    def cerrar(self):
+        self.datos.flush()
+        del self.plano
+        del self.datos
+        return
+
+    def __enter__(self):
+        return(self)
+
+    def __exit__(self, tipo, valor, traza):
+        self.cerrar()
+        return(False)
+
+
+########################
+
+#A=[[1,2],[3,4]]
+#B=matriz([[1.1,2.2],[30,40]])
+
+#P=multiplicar(A,B)     #modo nativo: P es un ndarray complex128
+#print ("Producto de ", A, " * ", B, " = ", lista(P))
@@ -0,0 +1,89 @@
+#Operadores de permutación (dispersos) para n-qubits
+#CNOT, Toffoli y los oráculos booleanos sólo reordenan los estados de la base,
+#así que se guardan como un arreglo de índices de largo 2^n (memoria O(2^n))
+#y se aplican con una sola indexación (tiempo O(2^n)), en lugar de una matriz
+#densa de 2^n x 2^n.
+#
+#Convención de qubits igual a Q_Lenguaje: el qubit 0 es el bit más significativo.
+
+import numpy as np
+
+from qlenguage import vectorestado as ve
+from qlenguage import indices as ix
+from qlenguage.indices import mascara
+
+########################
+#Operador P tal que (P psi)[i] = fases[i] * psi[origen[i]]
+#Sin fases es una matriz de permutación; con fases es una matriz monomial
+#(una sola entrada no nula por fila), ej. CZ o un oráculo de fase.
+class Permutacion:
+    def __init__(self, origen, fases=None):
+        self.origen = np.asarray(origen, dtype=np.intp)
+        self.fases = None if fases is None else np.asarray(fases, dtype=np.complex128)
+        self.dimension = len(self.origen)
+        self.cantqubits = ve.cantQubits(self.origen)
+
+    #Aplica el operador a psi (ndarray 1D) en el lugar
+    def aplicarVector(self, psi):
+        psi[:] = psi[self.origen]
+        if self.fases is not None:
+            psi *= self.fases
+        return(psi)
+
+    #Aplica el operador a un vector columna (lista o ndarray); retorna el mismo formato
+    def aplicar(self, vector):
+        if (len(vector[0]) != 1 or len(vector) != self.dimension):
+            return(0)
+        psi = np.array(vector).reshape(-1)      #conserva enteros/reales si no hay fases
+        if self.fases is not None:
+            psi = psi.astype(np.complex128)
+        return(ve.aColumna(self.aplicarVector(psi), vector, *([] if self.fases is None else [self.fases])))
+
+    #Operador compuesto self * otra (primero se aplica otra y después self)
+    def componer(self, otra):
+        origen = otra.origen[self.origen]
+        fases = None
+        if self.fases is not None or otra.fases is not None:
+            fases = np.ones(self.dimension, dtype=np.complex128)
+            if otra.fases is not None:
+                fases *= otra.fases[self.origen]
+            if self.fases is not None:
+                fases *= self.fases
+        return(Permutacion(origen, fases))
+
+    #Matriz densa equivalente como lista de listas (compatible con multiplicar())
+    def matriz(self):
+        R = np.zeros((self.dimension, self.dimension), dtype=np.int64 if self.fases is None else np.complex128)
+        R[np.arange(self.dimension), self.origen] = 1 if self.fases is None else self.fases
+        return(R.tolist())
+
+#Controlled Not multicontrolada: invierte target si todos los controles están en 1
+def mcx(cantqubits, controles, target):
+    controles = list(controles)
+    ve.validarQubits(cantqubits, controles + [target])
+    indices = ix.indices(cantqubits).copy()
+    mc = ix.mascaras(cantqubits, controles)
+    activos = (indices & mc) == mc      #estados con todos los controles en 1
+    indices[activos] ^= mascara(cantqubits, target)
+    return(Permutacion(indices))
+
+#Controlled Not del qubit control al qubit target
+def cnot(cantqubits, control, target):
+    return(mcx(cantqubits, [control], target))
+
+#Toffoli (CCNOT) de los qubits control1 y control2 al qubit target
+def toffoli(cantqubits, control1, control2, target):
+    return(mcx(cantqubits, [control1, control2], target))
+
+#Oráculo Uf|x>|y> = |x>|y XOR f(x)> de una función booleana f de nentradas
+#f recibe los bits de x como enteros 0/1 (el primero es el más significativo),
+#ej: oraculo(lambda a, b: a and b, 2) es el oráculo AND de 2 entradas (Uand2)
+def oraculo(f, nentradas):
+    cantqubits = nentradas + 1
+    indices = np.arange(1 << cantqubits, dtype=np.intp)
+    for xv in range(1 << nentradas):
+        bits = [(xv >> (nentradas - 1 - k)) & 1 for k in range(nentradas)]
+        if f(*bits):
+            indices[2 * xv] = 2 * xv + 1    #el qubit auxiliar y es el último (bit menos significativo)
+            indices[2 * xv + 1] = 2 * xv
+    return(Permutacion(indices))
@@ -0,0 +1,202 @@
+#Kernels para vectores de estado de n-qubits
+#Aplican compuertas de 1 o 2 qubits directamente sobre el vector de estado
+#(actualizaciones por saltos "strided", O(2^n)) en lugar de armar la matriz
+#completa de 2^n x 2^n con tensorial() y multiplicarla.
+#
+#Convenciones (las mismas de Q_Lenguaje):
+# - psi es un ndarray 1D complex128 de largo 2^n, contiguo en memoria.
+# - El qubit 0 es el de más a la izquierda (bit más significativo), igual que
+#   en tensorial(q0, tensorial(q1, ...)) y en cxNqubit().
+# - Las funciones aplicar*() modifican psi en el lugar y lo retornan.
+
+import numpy as np
+
+from qlenguage import indices as ix
+
+########################
+#Cantidad de qubits de un vector de estado psi de largo 2^n
+def cantQubits(psi):
+    largo = len(psi)
+    n = largo.bit_length() - 1
+    if largo != 1 << n:
+        raise ValueError("el largo del vector de estado debe ser potencia de 2")
+    return(n)
+
+#Convierte un vector columna (lista [[a],[b],...] o ndarray) a psi 1D complex128
+#Siempre retorna una copia, así el vector original no se modifica
+def aVector(vector):
+    return(np.array(vector, dtype=np.complex128).reshape(-1))
+
+#Convierte psi al mismo formato de vector columna que el vector original
+#En listas se conserva el tipo de los números, como en matrices.py: el resultado
+#es del tipo común (np.result_type) del vector original y de los operadores o
+#tipos indicados (ej. la compuerta aplicada, o float si se normalizó), y sólo es
+#complejo si alguno de ellos lo es o si psi tiene parte imaginaria
+def aColumna(psi, original, *tipos):
+    if isinstance(original, np.ndarray):
+        return(psi.reshape(-1, 1))
+    tipo = np.result_type(np.asarray(original),
+                          *[t if isinstance(t, (type, np.dtype)) else np.asarray(t) for t in tipos])
+    if tipo.kind != 'c' and not np.any(np.imag(psi)):
+        psi = np.real(psi)
+        if tipo.kind in 'iub' and np.array_equal(psi, np.trunc(psi)):
+            psi = psi.astype(np.int64)
+    return(psi.reshape(-1, 1).tolist())
+
+#Lanza ValueError si qubits tiene repetidos o qubits fuera de rango en un sistema de n qubits
+def validarQubits(n, qubits):
+    if len(set(qubits)) != len(qubits) or not all(0 <= q < n for q in qubits):
+        raise ValueError("qubits repetidos o fuera de rango")
+
+#Aplica la compuerta U (2x2) al qubit indicado de psi
+def aplicar1q(psi, U, qubit):
+    n = cantQubits(psi)
+    validarQubits(n, [qubit])
+    U = np.asarray(U, dtype=np.complex128)
+    v = psi.reshape(1 << qubit, 2, -1)  #vista: [bits a la izq, qubit, bits a la der]
+    a0 = v[:, 0, :].copy()
+    a1 = v[:, 1, :]
+    v[:, 0, :] = U[0, 0] * a0 + U[0, 1] * a1
+    v[:, 1, :] = U[1, 0] * a0 + U[1, 1] * a1
+    return(psi)
+
+#Aplica la compuerta U (2^k x 2^k) a los k qubits indicados de psi
+#El primer qubit de la lista es el más significativo en la base de U
+#(ej: aplicar(psi, Cx, [control, target]))
+def aplicar(psi, U, qubits):
+    qubits = list(qubits)
+    if len(qubits) == 1:
+        return(aplicar1q(psi, U, qubits[0]))
+    n = cantQubits(psi)
+    k = len(qubits)
+    validarQubits(n, qubits)
+    U = np.asarray(U, dtype=np.complex128)
+    if U.shape != (1 << k, 1 << k):
+        raise ValueError("la compuerta no corresponde a la cantidad de qubits")
+    sub = np.moveaxis(psi.reshape((2,) * n), qubits, range(k)) #vista con los qubits al frente
+    nuevo = U @ sub.reshape(1 << k, -1)
+    sub[...] = nuevo.reshape(sub.shape)
+    return(psi)
+
+#Aplica una compuerta de 2 qubits (4x4) a los qubits q0 (más significativo) y q1
+def aplicar2q(psi, U, q0, q1):
+    return(aplicar(psi, U, [q0, q1]))
+
+#Aplica una compuerta diagonal de k qubits, dada por su diagonal (largo 2^k), a los
+#qubits indicados de psi: una multiplicación elemento a elemento en O(2^n) que
+#expande la diagonal por broadcasting, sin armar el vector de fases de largo 2^n
+def aplicarDiagonal(psi, diagonal, qubits):
+    qubits = list(qubits)
+    n = cantQubits(psi)
+    k = len(qubits)
+    validarQubits(n, qubits)
+    diagonal = np.asarray(diagonal, dtype=np.complex128)
+    if diagonal.shape != (1 << k,):
+        raise ValueError("la diagonal no corresponde a la cantidad de qubits")
+    D = diagonal.reshape((2,) * k).transpose(np.argsort(qubits))    #ejes en orden de qubit
+    forma = [1] * n
+    for q in qubits:
+        forma[q] = 2
+    psi.reshape((2,) * n)[...] *= D.reshape(forma)
+    return(psi)
+
+#Normaliza psi en el lugar; retorna None si la norma es 0
+def normalizar(psi):
+    norma = np.linalg.norm(psi)
+    if norma == 0:
+        return(None)
+    psi /= norma
+    return(psi)
+
+#Estado |00...0> de n qubits
+def ceros(cantqubits):
+    psi = np.zeros(1 << cantqubits, dtype=np.complex128)
+    psi[0] = 1
+    return(psi)
+
+#Generador aleatorio de NumPy a partir de una semilla (int), un Generator o None
+def generador(semilla=None):
+    return(np.random.default_rng(semilla))
+
+#Probabilidades |amplitud|^2 de cada estado de la base
+def probabilidades(psi):
+    return(psi.real ** 2 + psi.imag ** 2)
+
+#Cantidad de veces que se obtiene cada estado al medir psi tiros veces
+#Calcula las probabilidades una sola vez y sortea todas las mediciones juntas
+#con una única muestra multinomial. Retorna un ndarray de largo 2^n.
+def muestrearVector(psi, tiros, semilla=None):
+    p = probabilidades(psi)
+    p = p / p.sum()                     #evita errores de redondeo (suma != 1)
+    return(generador(semilla).multinomial(tiros, p))
+
+#Igual que muestrearVector() pero como diccionario {'0101': cantidad, ...}
+#con sólo los estados que aparecieron
+def muestrear(psi, tiros, semilla=None):
+    n = cantQubits(psi)
+    cuentas = muestrearVector(psi, tiros, semilla)
+    return({format(int(i), "b").zfill(n): int(cuentas[i]) for i in np.flatnonzero(cuentas)})
+
+#Mide sólo los qubits indicados de psi (medición parcial), modificando psi en el lugar
+#Calcula la probabilidad marginal de cada resultado, sortea uno, anula las
+#amplitudes que no corresponden y renormaliza, todo en O(2^n).
+#Retorna (bits, psi): bits es la lista de valores medidos, en el orden de qubits
+def medirQubits(psi, qubits, semilla=None):
+    n = cantQubits(psi)
+    qubits = list(qubits)
+    validarQubits(n, qubits)
+    r = ix.resultados(n, qubits)        #resultado de la medición en cada estado de la base
+    p = probabilidades(psi)
+    marginal = np.bincount(r, weights=p, minlength=1 << len(qubits))
+    m = int(generador(semilla).choice(len(marginal), p=marginal / marginal.sum()))
+    psi[r != m] = 0
+    psi /= np.sqrt(marginal[m])     #marginal[m] = |P_m psi|^2: queda normalizado aunque psi no lo estuviera
+    bits = [(m >> (len(qubits) - 1 - k)) & 1 for k in range(len(qubits))]
+    return(bits, psi)
+
+#Lanza ValueError si algún paso del programa de ramificar() no es una función
+#ni una medición ('medir', [qubits]) válida en un sistema de n qubits
+def validarPrograma(n, programa):
+    for paso in programa:
+        if callable(paso):
+            continue
+        if not isinstance(paso, (tuple, list)) or len(paso) != 2 or paso[0] != 'medir':
+            raise ValueError("paso desconocido")
+        try:
+            qubits = list(paso[1])
+        except TypeError:
+            raise ValueError("los qubits a medir deben ser una lista")
+        validarQubits(n, qubits)
+
+#Simula tiros repeticiones de un programa con mediciones intermedias, evolucionando
+#cada rama distinta una sola vez (en lugar de re-simular cada tiro desde el inicio)
+# programa: lista de pasos, cada uno es
+#   - una función f(psi, bits) que retorna el nuevo psi (bits = tupla de los bits
+#     medidos hasta ese paso, para correcciones clásicas como en teleportación)
+#   - o una tupla ('medir', [qubits]): los tiros de cada rama se reparten entre los
+#     resultados posibles con una muestra multinomial de las probabilidades marginales
+#Retorna diccionario {'bits medidos': (cantidad de tiros, psi final de la rama)}
+#Lanza ValueError (antes de simular) si algún paso no es válido
+def ramificar(psi, programa, tiros, semilla=None):
+    rng = generador(semilla)
+    n = cantQubits(psi)
+    validarPrograma(n, programa)
+    ramas = {(): (tiros, np.array(psi, dtype=np.complex128))}
+    for paso in programa:
+        if callable(paso):
+            ramas = {bits: (cuenta, paso(estado, bits)) for bits, (cuenta, estado) in ramas.items()}
+            continue
+        qubits = list(paso[1])
+        k = len(qubits)
+        r = ix.resultados(n, qubits)
+        nuevas = {}
+        for bits, (cuenta, estado) in ramas.items():
+            marginal = np.bincount(r, weights=probabilidades(estado), minlength=1 << k)
+            reparto = rng.multinomial(cuenta, marginal / marginal.sum())
+            for m in np.flatnonzero(reparto):
+                rama = np.where(r == m, estado, 0)
+                rama /= np.sqrt(marginal[m])     #|P_m psi|^2, no la probabilidad normalizada
+                medidos = tuple((int(m) >> (k - 1 - j)) & 1 for j in range(k))
+                nuevas[bits + medidos] = (int(reparto[m]), rama)
+        ramas = nuevas
+    return({''.join(map(str, bits)): rama for bits, rama in ramas.items()})
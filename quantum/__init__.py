@@ -1,4 +1,8 @@
-from .bernstein_vazirani import run_bernstein_vazirani
+from .bernstein_vazirani import run_bernstein_vazirani, run_bernstein_vazirani_batch
+from .cache import ResultCache, make_cache_key
+from .rendering import DiagramStore
+from .profiling import Profiler, stage, profiled
+from .stabilizer import StabilizerSimulator, run_clifford_circuit
 from .exceptions import QuantumCircuitError, InvalidInputError
 
-__all__ = ['run_bernstein_vazirani', 'QuantumCircuitError', 'InvalidInputError']
\ No newline at end of file
+__all__ = ['run_bernstein_vazirani', 'run_bernstein_vazirani_batch', 'ResultCache', 'make_cache_key', 'DiagramStore', 'Profiler', 'stage', 'profiled', 'StabilizerSimulator', 'run_clifford_circuit', 'QuantumCircuitError', 'InvalidInputError']
\ No newline at end of file
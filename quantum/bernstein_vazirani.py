@@ -1,10 +1,20 @@
-from typing import Tuple, Dict, Any
-from qiskit import QuantumCircuit
-from qiskit_aer import Aer
-from qiskit.visualization import circuit_drawer
+from __future__ import annotations
+from typing import TYPE_CHECKING, Tuple, Dict, Any, List, Optional
 import logging
-import os
 from .exceptions import QuantumCircuitError, InvalidInputError
+from .profiling import stage
+from .rendering import (RenderQueue, DiagramStore, IMAGE_FORMATS, circuit_hash, inline_diagram,
+                        render_circuit_bytes, render_circuit_diagram, READY)
+from .simulator import run_circuits
+from .stabilizer import run_clifford_circuit
+
+# qiskit is imported on first use so importing this module stays cheap
+if TYPE_CHECKING:
+    from qiskit import QuantumCircuit
+
+# 'aer' runs the qasm simulator; 'stabilizer' uses the polynomial-time Clifford
+# tableau simulator, which handles secrets of thousands of bits
+METHODS = ('aer', 'stabilizer')
 
 logger = logging.getLogger(__name__)
 
@@ -23,6 +33,8 @@ def create_bernstein_vazirani_circuit(secret_string: str) -> QuantumCircuit:
     """
     if not secret_string or not all(bit in '01' for bit in secret_string):
         raise InvalidInputError("Secret string must be non-empty and contain only '0' and '1'")
+    
+    from qiskit import QuantumCircuit
         
     n = len(secret_string)
     circuit = QuantumCircuit(n + 1, n)
@@ -35,7 +47,7 @@ def create_bernstein_vazirani_circuit(secret_string: str) -> QuantumCircuit:
     # Apply CNOT gates based on secret string
     for i in range(n):
         if secret_string[i] == '1':
-            logger.info(f"Adding CNOT from control qubit {n-1-i} (secret bit position {i})")
+            logger.debug("Adding CNOT from control qubit %d (secret bit position %d)", n-1-i, i)
             circuit.cx(n-1-i, n)
     
     # Apply final Hadamard gates and measure
@@ -44,13 +56,16 @@ def create_bernstein_vazirani_circuit(secret_string: str) -> QuantumCircuit:
     
     return circuit
 
-def save_circuit_diagram(circuit: QuantumCircuit, secret: str) -> str:
+def save_circuit_diagram(circuit: QuantumCircuit, secret: Optional[str] = None) -> str:
     """
     Save a visualization of the quantum circuit.
     
+    Diagrams are named by the circuit's content hash, so an existing PNG for
+    an identical circuit is reused instead of being drawn again.
+    
     Args:
         circuit (QuantumCircuit): The quantum circuit to visualize
-        secret (str): The secret string used to generate the circuit
+        secret (Optional[str]): The secret string used to generate the circuit (unused, kept for compatibility)
         
     Returns:
         str: Path to the saved circuit diagram
@@ -59,48 +74,184 @@ def save_circuit_diagram(circuit: QuantumCircuit, secret: str) -> str:
         QuantumCircuitError: If there's an error saving the circuit diagram
     """
     try:
-        path = f"pictures/bernstein_vazirani/circuit_{secret}.png"
-        fig = circuit_drawer(circuit, output='mpl')
-        fig.savefig(path)
-        return path
+        return render_circuit_diagram(circuit)
     except Exception as e:
         raise QuantumCircuitError(f"Failed to save circuit diagram: {str(e)}")
 
-def run_bernstein_vazirani(secret: str) -> Dict[str, Any]:
+def _diagram_fields(circuit: QuantumCircuit, secret: str, render: bool, render_queue: Optional[RenderQueue],
+                    image_format: str, diagram_store: Optional[DiagramStore]) -> Dict[str, Any]:
+    """
+    Produce (or queue) the diagram of a circuit.
+    
+    Returns:
+        Dict[str, Any]: The result fields describing the diagram
+            (circuit_image, circuit_hash, render_status, image_format)
+    """
+    if render and image_format != 'path':
+        # Drawn into memory and embedded in the result; nothing is written to disk
+        encoding = 'svg' if image_format == 'svg' else 'png'
+        if diagram_store is not None:
+            digest, image = diagram_store.render(circuit, encoding)
+        else:
+            digest, image = circuit_hash(circuit), render_circuit_bytes(circuit, encoding)
+        return {
+            'circuit_image': inline_diagram(image, encoding),
+            'circuit_hash': digest,
+            'render_status': READY,
+            'image_format': image_format
+        }
+    
+    # Hashing serializes the whole circuit, so it is skipped when nothing is drawn
+    digest = None
+    circuit_image = None
+    render_status = 'disabled'
+    if render and render_queue is not None:
+        digest, circuit_image, render_status = render_queue.submit(circuit)
+    elif render:
+        digest = circuit_hash(circuit)
+        circuit_image = save_circuit_diagram(circuit, secret)
+        render_status = READY
+    return {
+        'circuit_image': circuit_image,
+        'circuit_hash': digest,
+        'render_status': render_status,
+        'image_format': image_format
+    }
+
+def _prepare_circuit(secret: str, render: bool, render_queue: Optional[RenderQueue],
+                     image_format: str = 'path',
+                     diagram_store: Optional[DiagramStore] = None) -> Tuple[QuantumCircuit, Dict[str, Any]]:
+    """
+    Build the circuit for a secret and produce (or queue) its diagram.
+    
+    Returns:
+        Tuple[QuantumCircuit, Dict[str, Any]]: The circuit and the result fields describing its diagram
+    """
+    with stage('circuit_build'):
+        circuit = create_bernstein_vazirani_circuit(secret)
+    with stage('render'):
+        diagram = _diagram_fields(circuit, secret, render, render_queue, image_format, diagram_store)
+    return circuit, diagram
+
+def _decode_measurement(counts: Dict[str, int]) -> str:
+    """
+    Turn single-shot counts into the recovered secret.
+    """
+    measured = list(counts.keys())[0]
+    
+    # Reverse bits to match input format
+    final_result = measured[::-1]
+    logger.debug("Raw measurement (circuit order): %s", measured)
+    logger.debug("Final result (human readable): %s", final_result)
+    return final_result
+
+def _check_method(method: str, image_format: str = 'path') -> None:
+    if method not in METHODS:
+        raise InvalidInputError(f"Unknown method '{method}', expected one of {', '.join(METHODS)}")
+    if image_format not in IMAGE_FORMATS:
+        raise InvalidInputError(f"Unknown image format '{image_format}', expected one of {', '.join(IMAGE_FORMATS)}")
+
+def run_bernstein_vazirani(secret: str, render: bool = True,
+                           render_queue: Optional[RenderQueue] = None,
+                           method: str = 'aer', image_format: str = 'path',
+                           diagram_store: Optional[DiagramStore] = None) -> Dict[str, Any]:
     """
     Run the Bernstein-Vazirani algorithm with the given secret string.
     
     Args:
         secret (str): The secret binary string (reading left to right)
+        render (bool): Whether to produce a circuit diagram at all
+        render_queue (Optional[RenderQueue]): If given, the diagram is rendered in the
+            background and its path is returned right away with a 'pending' status
+        method (str): 'aer' (qasm simulator) or 'stabilizer' (Clifford tableau, polynomial time)
+        image_format (str): 'path' (PNG file on disk), 'svg' (inline SVG markup) or
+            'png_base64' (inline base64 PNG); inline diagrams are drawn in memory
+        diagram_store (Optional[DiagramStore]): In-memory store that keeps inline diagrams by circuit hash
         
     Returns:
-        Dict[str, Any]: Dictionary containing the result and circuit visualization path
+        Dict[str, Any]: Dictionary containing the result, the circuit visualization
+            (a path or the inline image, None when render is False), the circuit hash
+            (None when render is False), the render status and the image format
         
     Raises:
         InvalidInputError: If the input is invalid
         QuantumCircuitError: If there's an error in circuit execution
     """
     try:
-        # Create and visualize circuit
-        circuit = create_bernstein_vazirani_circuit(secret)
-        circuit_image = save_circuit_diagram(circuit, secret)
+        _check_method(method, image_format)
         
-        # Run simulation
-        simulator = Aer.get_backend('qasm_simulator')
-        result = simulator.run(circuit, shots=1).result()
-        counts = result.get_counts(circuit)
-        measured = list(counts.keys())[0]
+        # Create and visualize circuit
+        circuit, diagram = _prepare_circuit(secret, render, render_queue, image_format, diagram_store)
         
-        # Reverse bits to match input format
-        final_result = measured[::-1]
-        logger.info(f"Raw measurement (circuit order): {measured}")
-        logger.info(f"Final result (human readable): {final_result}")
+        with stage('simulate'):
+            if method == 'stabilizer':
+                counts = run_clifford_circuit(circuit, shots=1)
+            else:
+                # Run simulation on the shared, pre-warmed simulator
+                counts = run_circuits(circuit, shots=1).get_counts(circuit)
+        final_result = _decode_measurement(counts)
         
         return {
             'result': final_result,
-            'circuit_image': circuit_image,
+            **diagram,
+            'method': method,
             'secret': secret
         }
         
     except Exception as e:
-        raise QuantumCircuitError(f"Error running Bernstein-Vazirani algorithm: {str(e)}")
\ No newline at end of file
+        raise QuantumCircuitError(f"Error running Bernstein-Vazirani algorithm: {str(e)}")
+
+def run_bernstein_vazirani_batch(secrets: List[str], render: bool = False,
+                                 render_queue: Optional[RenderQueue] = None,
+                                 method: str = 'aer', image_format: str = 'path',
+                                 diagram_store: Optional[DiagramStore] = None) -> List[Dict[str, Any]]:
+    """
+    Run the Bernstein-Vazirani algorithm for many secrets as a single simulator job.
+    
+    All circuits are built first and submitted together, so the simulator
+    dispatch overhead is paid once for the whole batch.
+    
+    Args:
+        secrets (List[str]): The secret binary strings (reading left to right)
+        render (bool): Whether to produce circuit diagrams
+        render_queue (Optional[RenderQueue]): Background queue for the diagrams, if any
+        method (str): 'aer' (qasm simulator) or 'stabilizer' (Clifford tableau, polynomial time)
+        image_format (str): 'path' (PNG file on disk), 'svg' (inline SVG markup) or
+            'png_base64' (inline base64 PNG); inline diagrams are drawn in memory
+        diagram_store (Optional[DiagramStore]): In-memory store that keeps inline diagrams by circuit hash
+        
+    Returns:
+        List[Dict[str, Any]]: One result dictionary per secret, in the same order and
+            with the same fields as run_bernstein_vazirani
+        
+    Raises:
+        InvalidInputError: If the input is invalid
+        QuantumCircuitError: If there's an error in circuit execution
+    """
+    if not secrets:
+        return []
+    try:
+        _check_method(method, image_format)
+        prepared = [_prepare_circuit(secret, render, render_queue, image_format, diagram_store)
+                    for secret in secrets]
+        circuits = [circuit for circuit, _ in prepared]
+        
+        with stage('simulate'):
+            if method == 'stabilizer':
+                all_counts = [run_clifford_circuit(circuit, shots=1) for circuit in circuits]
+            else:
+                result = run_circuits(circuits, shots=1)
+                all_counts = [result.get_counts(i) for i in range(len(circuits))]
+        
+        return [
+            {
+                'result': _decode_measurement(all_counts[i]),
+                **diagram,
+                'method': method,
+                'secret': secret
+            }
+            for i, (secret, (_, diagram)) in enumerate(zip(secrets, prepared))
+        ]
+        
+    except Exception as e:
+        raise QuantumCircuitError(f"Error running Bernstein-Vazirani batch: {str(e)}")
\ No newline at end of file
@@ -0,0 +1,131 @@
+from typing import Any, Callable, Dict, Hashable, Optional, Tuple
+from collections import OrderedDict
+import threading
+import time
+
+_MISSING = object()
+
+def make_cache_key(name: str, *args: Any, **options: Any) -> Tuple:
+    """
+    Build a hashable cache key from an algorithm name, its arguments and options.
+    
+    Args:
+        name (str): Name of the cached algorithm
+        *args: Positional arguments of the call
+        **options: Keyword options (e.g. simulator settings); order does not matter
+        
+    Returns:
+        Tuple: A hashable key
+    """
+    return (name, args, tuple(sorted(options.items())))
+
+class ResultCache:
+    """
+    Thread-safe bounded LRU cache with an optional time-to-live per entry.
+    
+    Keeps hit, miss, eviction and expiration counters so callers can expose
+    them (see ``stats``).
+    """
+    
+    def __init__(self, maxsize: int = 256, ttl: Optional[float] = None,
+                 clock: Callable[[], float] = time.monotonic):
+        """
+        Args:
+            maxsize (int): Maximum number of entries kept; least recently used are evicted first
+            ttl (Optional[float]): Seconds an entry stays valid, or None to never expire
+            clock (Callable[[], float]): Monotonic time source (injectable for tests)
+        """
+        if maxsize < 1:
+            raise ValueError("maxsize must be at least 1")
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._clock = clock
+        self._data: "OrderedDict[Hashable, Tuple[Optional[float], Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+    
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        """
+        Return the cached value for key, or default on a miss or expired entry.
+        """
+        with self._lock:
+            entry = self._data.get(key, _MISSING)
+            if entry is not _MISSING:
+                expires_at, value = entry
+                if expires_at is None or self._clock() < expires_at:
+                    self._data.move_to_end(key)
+                    self.hits += 1
+                    return value
+                del self._data[key]
+                self.expirations += 1
+            self.misses += 1
+            return default
+    
+    def set(self, key: Hashable, value: Any) -> None:
+        """
+        Store value under key, evicting the least recently used entry if full.
+        """
+        expires_at = None if self.ttl is None else self._clock() + self.ttl
+        with self._lock:
+            self._data[key] = (expires_at, value)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+                self.evictions += 1
+    
+    def get_or_compute(self, key: Hashable, compute: Callable[[], Any],
+                       cacheable: Optional[Callable[[Any], bool]] = None) -> Tuple[Any, bool]:
+        """
+        Return the cached value for key, computing and storing it on a miss.
+        
+        The computation runs outside the lock, so concurrent misses for the
+        same key may compute it more than once; the last result wins.
+        
+        Args:
+            key (Hashable): Cache key
+            compute (Callable[[], Any]): Produces the value on a miss
+            cacheable (Optional[Callable[[Any], bool]]): If given, a computed value
+                is only stored when this returns True (e.g. to skip partial results)
+        
+        Returns:
+            Tuple[Any, bool]: The value and whether it came from the cache
+        """
+        value = self.get(key, _MISSING)
+        if value is not _MISSING:
+            return value, True
+        value = compute()
+        if cacheable is None or cacheable(value):
+            self.set(key, value)
+        return value, False
+    
+    def clear(self) -> None:
+        """Remove every entry (counters are kept)."""
+        with self._lock:
+            self._data.clear()
+    
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._data)
+    
+    def stats(self) -> Dict[str, Any]:
+        """
+        Snapshot of the cache counters.
+        
+        Returns:
+            Dict[str, Any]: hits, misses, hit_rate, evictions, expirations, size, maxsize and ttl
+        """
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'hit_rate': self.hits / lookups if lookups else 0.0,
+                'evictions': self.evictions,
+                'expirations': self.expirations,
+                'size': len(self._data),
+                'maxsize': self.maxsize,
+                'ttl': self.ttl
+            }
@@ -4,4 +4,8 @@ class QuantumCircuitError(Exception):
 
 class InvalidInputError(Exception):
     """Raised when invalid input is provided to quantum algorithms"""
-    pass
\ No newline at end of file
+    pass
+
+class JobQueueFullError(Exception):
+    """Raised when the job queue has reached its configured depth"""
+    pass
@@ -0,0 +1,320 @@
+from typing import Any, Callable, Dict, List, Optional
+from concurrent.futures import Future, ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+import json
+import logging
+import multiprocessing
+import os
+import tempfile
+import threading
+import time
+import uuid
+from .exceptions import JobQueueFullError
+
+logger = logging.getLogger(__name__)
+
+# Job states reported to clients
+QUEUED = 'queued'
+RUNNING = 'running'
+DONE = 'done'
+FAILED = 'failed'
+
+# Seconds between reads of the shared store while waiting on another process's job
+STORE_POLL_INTERVAL = 0.1
+
+class JobStore:
+    """
+    Job records shared between server processes, one JSON file per job.
+    
+    The process that runs a job writes its record on every state change
+    (atomically, via rename); any process can read it. This lets several
+    gunicorn workers answer /jobs/<id> polls for jobs accepted by another
+    worker on the same host.
+    """
+    
+    def __init__(self, directory: str):
+        """
+        Args:
+            directory (str): Directory holding the job records (created if missing)
+        """
+        self.directory = directory
+        os.makedirs(directory, exist_ok=True)
+    
+    def _path(self, job_id: str) -> str:
+        return os.path.join(self.directory, f'{job_id}.json')
+    
+    def write(self, job_id: str, record: Dict[str, Any]) -> None:
+        """Store (or replace) the record of a job."""
+        fd, tmp_path = tempfile.mkstemp(dir=self.directory, suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'w') as tmp:
+                json.dump(record, tmp)
+            os.replace(tmp_path, self._path(job_id))
+        except BaseException:
+            if os.path.exists(tmp_path):
+                os.unlink(tmp_path)
+            raise
+    
+    def read(self, job_id: str) -> Optional[Dict[str, Any]]:
+        """Record of a job, or None if it is unknown or expired."""
+        if not all(c.isalnum() for c in job_id):
+            return None
+        try:
+            with open(self._path(job_id)) as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+    
+    def delete(self, job_id: str) -> None:
+        try:
+            os.unlink(self._path(job_id))
+        except OSError:
+            pass
+    
+    def records(self) -> List[Dict[str, Any]]:
+        """Records of every stored job."""
+        records = []
+        for name in os.listdir(self.directory):
+            if name.endswith('.json'):
+                record = self.read(name[:-len('.json')])
+                if record is not None:
+                    records.append(record)
+        return records
+    
+    def prune(self, retention: float) -> None:
+        """Remove records finished more than retention seconds ago (including other processes' jobs)."""
+        now = time.time()
+        for record in self.records():
+            if record['finished_at'] is not None and now - record['finished_at'] > retention:
+                self.delete(record['job_id'])
+
+def _run_tracked(store_dir: str, record: Dict[str, Any], fn: Callable[..., Any],
+                 args: tuple, kwargs: Dict[str, Any]) -> Any:
+    # Runs in the pool process: publishes the running state before calling fn
+    JobStore(store_dir).write(record['job_id'], {**record, 'status': RUNNING})
+    return fn(*args, **kwargs)
+
+class JobManager:
+    """
+    Runs algorithm calls on a pool of worker processes and tracks them by job id.
+    
+    Clients submit work, get an id back immediately, and poll (or wait on) the
+    job until its result is available, so no request thread is held while the
+    simulation runs. Finished jobs are kept for ``retention`` seconds.
+    
+    Without a store, jobs are only visible to the process that accepted them.
+    With a ``JobStore``, job records are also published there, so any process
+    sharing the store can report on them.
+    """
+    
+    def __init__(self, max_workers: Optional[int] = None, max_queue: int = 100,
+                 retention: float = 600.0, start_method: str = 'spawn',
+                 store: Optional[JobStore] = None):
+        """
+        Args:
+            max_workers (Optional[int]): Worker processes (defaults to the number of CPUs)
+            max_queue (int): Maximum number of unfinished jobs accepted at once
+            retention (float): Seconds a finished job stays available for polling
+            start_method (str): multiprocessing start method for the workers
+            store (Optional[JobStore]): Shared store for job records
+        """
+        self.max_workers = max_workers or multiprocessing.cpu_count()
+        self.max_queue = max_queue
+        self.retention = retention
+        self.start_method = start_method
+        self.store = store
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self._jobs: Dict[str, Dict[str, Any]] = {}
+        self._lock = threading.Lock()
+        self._changed = threading.Condition(self._lock)
+    
+    def configure(self, max_workers: Optional[int] = None, store: Optional[JobStore] = None) -> None:
+        """
+        Change the pool size and/or the job store before the pool is first used
+        (e.g. in a pre-fork master, once the number of server workers is known).
+        
+        Raises:
+            RuntimeError: If the worker pool has already been started
+        """
+        with self._lock:
+            if self._executor is not None:
+                raise RuntimeError("JobManager is already running")
+            if max_workers is not None:
+                self.max_workers = max(1, max_workers)
+            if store is not None:
+                self.store = store
+    
+    def _get_executor(self) -> ProcessPoolExecutor:
+        # Created on first use so forked server workers each get their own pool
+        if self._executor is None:
+            self._executor = ProcessPoolExecutor(
+                max_workers=self.max_workers,
+                mp_context=multiprocessing.get_context(self.start_method))
+        return self._executor
+    
+    def _submit_to_pool(self, fn: Callable[..., Any], *args: Any, **kwargs: Any) -> Future:
+        # A worker process that dies (e.g. killed for memory) breaks the whole pool:
+        # its jobs fail and every later submit would raise, so start a fresh pool once
+        try:
+            return self._get_executor().submit(fn, *args, **kwargs)
+        except BrokenProcessPool:
+            logger.warning("Job worker pool is broken, starting a new one")
+            broken, self._executor = self._executor, None
+            broken.shutdown(wait=False)
+            return self._get_executor().submit(fn, *args, **kwargs)
+    
+    def _prune(self) -> None:
+        now = time.time()
+        expired = [job_id for job_id, job in self._jobs.items()
+                   if job['finished_at'] is not None and now - job['finished_at'] > self.retention]
+        for job_id in expired:
+            del self._jobs[job_id]
+        if self.store is not None:
+            self.store.prune(self.retention)
+    
+    def pending_count(self) -> int:
+        """Number of jobs that are queued or running."""
+        with self._lock:
+            return sum(1 for job in self._jobs.values() if job['finished_at'] is None)
+    
+    def submit(self, fn: Callable[..., Any], *args: Any,
+               on_done: Optional[Callable[[Any], None]] = None, **kwargs: Any) -> str:
+        """
+        Queue fn(*args, **kwargs) for execution in a worker process.
+        
+        Args:
+            fn (Callable[..., Any]): Module-level (picklable) function to run
+            on_done (Optional[Callable[[Any], None]]): Called with the result in this
+                process when the job succeeds (e.g. to fill a cache)
+            
+        Returns:
+            str: The job id
+            
+        Raises:
+            JobQueueFullError: If max_queue jobs are already waiting or running
+            RuntimeError: If the worker pool cannot accept work (e.g. it is shutting down)
+        """
+        with self._lock:
+            self._prune()
+            pending = sum(1 for job in self._jobs.values() if job['finished_at'] is None)
+            if pending >= self.max_queue:
+                raise JobQueueFullError(f"Job queue is full ({self.max_queue} jobs pending)")
+            job_id = uuid.uuid4().hex
+            submitted_at = time.time()
+            if self.store is not None:
+                record = {'job_id': job_id, 'status': QUEUED, 'submitted_at': submitted_at, 'finished_at': None}
+                self.store.write(job_id, record)
+                try:
+                    future = self._submit_to_pool(_run_tracked, self.store.directory, record, fn, args, kwargs)
+                except BaseException:
+                    self.store.delete(job_id)     # never accepted
+                    raise
+            else:
+                future = self._submit_to_pool(fn, *args, **kwargs)
+            self._jobs[job_id] = {
+                'future': future,
+                'submitted_at': submitted_at,
+                'finished_at': None
+            }
+        future.add_done_callback(lambda f: self._finish(job_id, f, on_done))
+        return job_id
+    
+    def _finish(self, job_id: str, future: Future, on_done: Optional[Callable[[Any], None]]) -> None:
+        if on_done is not None and not future.cancelled() and future.exception() is None:
+            try:
+                on_done(future.result())
+            except Exception:
+                logger.exception("Completion callback failed for job %s", job_id)
+        with self._changed:
+            job = self._jobs.get(job_id)
+            if job is not None:
+                job['finished_at'] = time.time()
+                if self.store is not None:
+                    self._publish(job_id, job)
+            self._changed.notify_all()
+    
+    def _publish(self, job_id: str, job: Dict[str, Any]) -> None:
+        try:
+            self.store.write(job_id, self._snapshot(job_id, job))
+        except (OSError, TypeError, ValueError):
+            logger.exception("Failed to publish job %s to the job store", job_id)
+    
+    def _snapshot(self, job_id: str, job: Dict[str, Any]) -> Dict[str, Any]:
+        future: Future = job['future']
+        snapshot: Dict[str, Any] = {
+            'job_id': job_id,
+            'submitted_at': job['submitted_at'],
+            'finished_at': job['finished_at']
+        }
+        if job['finished_at'] is None:
+            snapshot['status'] = RUNNING if future.running() else QUEUED
+        elif future.cancelled():
+            snapshot['status'] = FAILED
+            snapshot['error'] = 'Job was cancelled'
+        elif future.exception() is not None:
+            snapshot['status'] = FAILED
+            snapshot['error'] = str(future.exception())
+        else:
+            snapshot['status'] = DONE
+            snapshot['result'] = future.result()
+        return snapshot
+    
+    def get(self, job_id: str, wait: float = 0.0) -> Optional[Dict[str, Any]]:
+        """
+        Status of a job, optionally waiting up to ``wait`` seconds for it to finish.
+        
+        Returns:
+            Optional[Dict[str, Any]]: job_id, status, timestamps and the result or
+                error once finished; None if the job id is unknown or expired
+        """
+        deadline = time.monotonic() + wait
+        with self._changed:
+            while True:
+                job = self._jobs.get(job_id)
+                if job is None:
+                    break
+                remaining = deadline - time.monotonic()
+                if job['finished_at'] is not None or remaining <= 0:
+                    return self._snapshot(job_id, job)
+                self._changed.wait(remaining)
+        return self._get_shared(job_id, deadline)
+    
+    def _get_shared(self, job_id: str, deadline: float) -> Optional[Dict[str, Any]]:
+        # A job accepted by another process: poll its record in the shared store
+        if self.store is None:
+            return None
+        while True:
+            record = self.store.read(job_id)
+            remaining = deadline - time.monotonic()
+            if record is None or record['finished_at'] is not None or remaining <= 0:
+                return record
+            time.sleep(min(STORE_POLL_INTERVAL, remaining))
+    
+    def stats(self) -> Dict[str, Any]:
+        """Counts of tracked jobs by status (across all processes sharing the store) plus the pool configuration."""
+        if self.store is not None:
+            snapshots = self.store.records()
+        else:
+            with self._lock:
+                snapshots = [self._snapshot(job_id, job) for job_id, job in self._jobs.items()]
+        counts = {QUEUED: 0, RUNNING: 0, DONE: 0, FAILED: 0}
+        for snapshot in snapshots:
+            counts[snapshot['status']] += 1
+        return {
+            **counts,
+            'max_workers': self.max_workers,
+            'max_queue': self.max_queue
+        }
+    
+    def shutdown(self, wait: bool = True, cancel_pending: bool = False) -> None:
+        """
+        Stop the worker pool.
+        
+        Args:
+            wait (bool): Block until running jobs finish
+            cancel_pending (bool): Cancel jobs that have not started yet
+        """
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=wait, cancel_futures=cancel_pending)
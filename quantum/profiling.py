@@ -0,0 +1,150 @@
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Callable, Dict, Iterator, List, Optional
+import functools
+import time
+
+# Profiler collecting stages in the current context (request, thread or task);
+# None means profiling is off and stages cost a single lookup
+_active: ContextVar[Optional['Profiler']] = ContextVar('quantum_profiler', default=None)
+
+class Profiler:
+    """
+    Collects wall-clock and CPU time per named stage.
+
+    Stages are recorded with ``stage()`` or ``profiled()`` anywhere in the
+    call stack while the profiler is active. Nested stages are named after
+    their parent ('simulate.transpile'), so top-level stages never overlap.
+
+    Usage:
+        with Profiler() as profiler:
+            run_bernstein_vazirani('1011')
+        profiler.report()
+    """
+
+    def __init__(self):
+        self.stages: Dict[str, Dict[str, float]] = {}
+        self._stack: List[str] = []
+        self._token = None
+
+    def activate(self) -> 'Profiler':
+        """Make this the active profiler of the current context."""
+        self._token = _active.set(self)
+        return self
+
+    def deactivate(self) -> None:
+        """Restore the profiler that was active before ``activate``."""
+        if self._token is not None:
+            _active.reset(self._token)
+            self._token = None
+
+    def __enter__(self) -> 'Profiler':
+        return self.activate()
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.deactivate()
+
+    def record(self, name: str, wall: float, cpu: float) -> None:
+        """
+        Add one measurement to a stage.
+
+        Args:
+            name (str): Full stage name
+            wall (float): Wall-clock seconds
+            cpu (float): CPU seconds of the calling thread
+        """
+        entry = self.stages.get(name)
+        if entry is None:
+            entry = self.stages[name] = {'wall': 0.0, 'cpu': 0.0, 'calls': 0}
+        entry['wall'] += wall
+        entry['cpu'] += cpu
+        entry['calls'] += 1
+
+    @contextmanager
+    def measure(self, name: str) -> Iterator[None]:
+        """Time the enclosed block as a stage of this profiler."""
+        full_name = f"{self._stack[-1]}.{name}" if self._stack else name
+        self._stack.append(full_name)
+        wall_start = time.perf_counter()
+        cpu_start = time.thread_time()
+        try:
+            yield
+        finally:
+            self.record(full_name, time.perf_counter() - wall_start, time.thread_time() - cpu_start)
+            self._stack.pop()
+
+    def timings(self, top_level: bool = True) -> Dict[str, float]:
+        """
+        Wall-clock seconds per stage.
+
+        Args:
+            top_level (bool): Only include stages that are not nested in another stage
+
+        Returns:
+            Dict[str, float]: Seconds keyed by stage name
+        """
+        return {name: entry['wall'] for name, entry in self.stages.items()
+                if not top_level or '.' not in name}
+
+    def report(self) -> Dict[str, Dict[str, float]]:
+        """
+        Wall and CPU time of every stage in milliseconds, for debug output.
+
+        Returns:
+            Dict[str, Dict[str, float]]: {stage: {'wall_ms', 'cpu_ms', 'calls'}}
+        """
+        return {
+            name: {
+                'wall_ms': round(entry['wall'] * 1000, 3),
+                'cpu_ms': round(entry['cpu'] * 1000, 3),
+                'calls': entry['calls']
+            }
+            for name, entry in self.stages.items()
+        }
+
+class _NoStage:
+    """Reusable no-op context manager returned when profiling is off."""
+
+    def __enter__(self) -> None:
+        return None
+
+    def __exit__(self, *exc_info: Any) -> None:
+        return None
+
+_NO_STAGE = _NoStage()
+
+def current_profiler() -> Optional[Profiler]:
+    """The profiler active in this context, if any."""
+    return _active.get()
+
+def stage(name: str):
+    """
+    Context manager timing a stage on the active profiler; a no-op when none is active.
+
+    Args:
+        name (str): Stage name, e.g. 'circuit_build'
+    """
+    profiler = _active.get()
+    if profiler is None:
+        return _NO_STAGE
+    return profiler.measure(name)
+
+def profiled(name: Optional[str] = None) -> Callable[[Callable], Callable]:
+    """
+    Decorator recording every call of a function as a stage.
+
+    Args:
+        name (Optional[str]): Stage name, the function name by default
+    """
+    def decorator(function: Callable) -> Callable:
+        stage_name = name or function.__name__
+
+        @functools.wraps(function)
+        def wrapper(*args: Any, **kwargs: Any) -> Any:
+            profiler = _active.get()
+            if profiler is None:
+                return function(*args, **kwargs)
+            with profiler.measure(stage_name):
+                return function(*args, **kwargs)
+        return wrapper
+    return decorator
@@ -0,0 +1,252 @@
+from __future__ import annotations
+from typing import TYPE_CHECKING, Any, Dict, Optional, Tuple
+import base64
+import hashlib
+import importlib
+import io
+import logging
+import os
+import queue
+import threading
+from .cache import ResultCache
+from .profiling import profiled
+
+# qiskit and matplotlib are imported on first use so importing this module stays cheap
+if TYPE_CHECKING:
+    from qiskit import QuantumCircuit
+
+logger = logging.getLogger(__name__)
+
+DIAGRAM_DIR = 'pictures/bernstein_vazirani'
+
+# Render states reported to clients
+READY = 'ready'
+PENDING = 'pending'
+FAILED = 'failed'
+SKIPPED = 'skipped'
+UNKNOWN = 'unknown'
+
+# How a diagram is returned: a file path, inline SVG markup or an inline base64 PNG
+IMAGE_FORMATS = ('path', 'svg', 'png_base64')
+MIMETYPES = {'svg': 'image/svg+xml', 'png': 'image/png'}
+
+# pyplot keeps global state, so only one diagram is drawn at a time
+_draw_lock = threading.Lock()
+_pyplot = None
+
+def _get_pyplot():
+    """
+    Import pyplot with the non-interactive Agg backend, selected once per process.
+    """
+    global _pyplot
+    if _pyplot is None:
+        import matplotlib
+        matplotlib.use('Agg')
+        import matplotlib.pyplot as plt
+        _pyplot = plt
+    return _pyplot
+
+def preload_renderer() -> None:
+    """
+    Import the drawing stack now (e.g. before forking server workers) instead of on first render.
+    """
+    _get_pyplot()
+    for module in ('qiskit.visualization', 'qiskit.qasm2'):
+        importlib.import_module(module)
+
+def circuit_hash(circuit: QuantumCircuit) -> str:
+    """
+    Content hash of a circuit, used to name and reuse its rendered diagram.
+
+    Args:
+        circuit (QuantumCircuit): The circuit to hash
+
+    Returns:
+        str: Hex digest that only changes when the circuit changes
+    """
+    from qiskit import qasm2
+    return hashlib.sha256(qasm2.dumps(circuit).encode('utf-8')).hexdigest()[:16]
+
+def diagram_path(digest: str, directory: str = DIAGRAM_DIR) -> str:
+    """
+    Path of the PNG diagram for a circuit hash.
+    """
+    return f"{directory}/circuit_{digest}.png"
+
+@profiled('draw')
+def render_circuit_diagram(circuit: QuantumCircuit, directory: str = DIAGRAM_DIR) -> str:
+    """
+    Render a circuit diagram to PNG, reusing the file if it was already rendered.
+
+    The image is written to a temporary file and moved into place, so readers
+    never see a partially written PNG, and the figure is closed afterwards.
+
+    Args:
+        circuit (QuantumCircuit): The circuit to draw
+        directory (str): Directory holding the rendered diagrams
+
+    Returns:
+        str: Path to the diagram
+    """
+    path = diagram_path(circuit_hash(circuit), directory)
+    if os.path.exists(path):
+        return path
+    os.makedirs(directory, exist_ok=True)
+    tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+    with _draw_lock:
+        plt = _get_pyplot()
+        from qiskit.visualization import circuit_drawer
+        fig = circuit_drawer(circuit, output='mpl')
+        try:
+            fig.savefig(tmp_path, format='png')
+        finally:
+            plt.close(fig)
+    os.replace(tmp_path, path)
+    return path
+
+@profiled('draw')
+def render_circuit_bytes(circuit: QuantumCircuit, image_format: str = 'png') -> bytes:
+    """
+    Render a circuit diagram into memory, without touching the filesystem.
+    
+    Args:
+        circuit (QuantumCircuit): The circuit to draw
+        image_format (str): 'png' or 'svg'
+        
+    Returns:
+        bytes: The encoded image
+    """
+    if image_format not in MIMETYPES:
+        raise ValueError(f"Unsupported image format '{image_format}'")
+    buffer = io.BytesIO()
+    with _draw_lock:
+        plt = _get_pyplot()
+        from qiskit.visualization import circuit_drawer
+        fig = circuit_drawer(circuit, output='mpl')
+        try:
+            fig.savefig(buffer, format=image_format)
+        finally:
+            plt.close(fig)
+    return buffer.getvalue()
+
+class DiagramStore:
+    """
+    In-memory LRU of rendered diagrams keyed by circuit hash and image format.
+    
+    Lets diagrams be embedded in responses or streamed by hash without writing
+    them to disk; identical circuits are drawn once.
+    """
+    
+    def __init__(self, maxsize: int = 128):
+        """
+        Args:
+            maxsize (int): Maximum number of images kept in memory
+        """
+        self._cache = ResultCache(maxsize=maxsize)
+    
+    def render(self, circuit: QuantumCircuit, image_format: str = 'png') -> Tuple[str, bytes]:
+        """
+        Return the diagram of a circuit, drawing it only if it is not stored yet.
+        
+        Returns:
+            Tuple[str, bytes]: Circuit hash and encoded image
+        """
+        digest = circuit_hash(circuit)
+        image, _ = self._cache.get_or_compute(
+            (digest, image_format), lambda: render_circuit_bytes(circuit, image_format))
+        return digest, image
+    
+    def get(self, digest: str, image_format: str = 'png') -> Optional[bytes]:
+        """
+        Stored image for a circuit hash, or None if it was never rendered (or was evicted).
+        """
+        return self._cache.get((digest, image_format))
+    
+    def stats(self) -> Dict[str, Any]:
+        """Hit/miss counters of the stored diagrams."""
+        return self._cache.stats()
+
+def inline_diagram(image: bytes, image_format: str) -> str:
+    """
+    Encode an in-memory diagram for a JSON response: SVG as text, PNG as base64.
+    """
+    if image_format == 'svg':
+        return image.decode('utf-8')
+    return base64.b64encode(image).decode('ascii')
+
+class RenderQueue:
+    """
+    Background worker that renders circuit diagrams off the request path.
+
+    Requests submit a circuit and immediately get back the diagram path and
+    its status; clients poll ``status`` (or fetch the image) until it is ready.
+    """
+
+    def __init__(self, directory: str = DIAGRAM_DIR, maxsize: int = 64):
+        """
+        Args:
+            directory (str): Directory holding the rendered diagrams
+            maxsize (int): Maximum number of diagrams waiting to be rendered
+        """
+        self.directory = directory
+        self._queue: "queue.Queue[Tuple[str, QuantumCircuit]]" = queue.Queue(maxsize=maxsize)
+        self._status: Dict[str, str] = {}
+        self._lock = threading.Lock()
+        self._worker: Optional[threading.Thread] = None
+
+    def _ensure_worker(self) -> None:
+        # Started lazily so the thread is created in the process that uses it
+        if self._worker is None or not self._worker.is_alive():
+            self._worker = threading.Thread(target=self._run, name='render-queue', daemon=True)
+            self._worker.start()
+
+    def submit(self, circuit: QuantumCircuit) -> Tuple[str, str, str]:
+        """
+        Queue a circuit for rendering unless its diagram already exists.
+
+        Args:
+            circuit (QuantumCircuit): The circuit to draw
+
+        Returns:
+            Tuple[str, str, str]: Circuit hash, diagram path and render status
+        """
+        digest = circuit_hash(circuit)
+        path = diagram_path(digest, self.directory)
+        with self._lock:
+            if os.path.exists(path):
+                self._status[digest] = READY
+                return digest, path, READY
+            if self._status.get(digest) == PENDING:
+                return digest, path, PENDING
+            try:
+                self._queue.put_nowait((digest, circuit))
+            except queue.Full:
+                logger.warning("Render queue full, skipping diagram %s", digest)
+                return digest, path, SKIPPED
+            self._status[digest] = PENDING
+            self._ensure_worker()
+        return digest, path, PENDING
+
+    def status(self, digest: str) -> str:
+        """
+        Current render status of a circuit hash.
+        """
+        if os.path.exists(diagram_path(digest, self.directory)):
+            return READY
+        with self._lock:
+            status = self._status.get(digest, UNKNOWN)
+        # A diagram recorded as ready whose file is gone was removed after rendering
+        return UNKNOWN if status == READY else status
+
+    def _run(self) -> None:
+        while True:
+            digest, circuit = self._queue.get()
+            try:
+                render_circuit_diagram(circuit, self.directory)
+                status = READY
+            except Exception:
+                logger.exception("Failed to render circuit diagram %s", digest)
+                status = FAILED
+            with self._lock:
+                self._status[digest] = status
+            self._queue.task_done()
@@ -0,0 +1,67 @@
+from __future__ import annotations
+from typing import TYPE_CHECKING, List, Union
+import logging
+import threading
+import time
+from .profiling import profiled
+
+# qiskit and Aer are imported on first use so importing this module stays cheap
+if TYPE_CHECKING:
+    from qiskit import QuantumCircuit
+
+logger = logging.getLogger(__name__)
+
+_simulator = None
+_init_lock = threading.Lock()
+
+def get_simulator():
+    """
+    Return the shared qasm simulator, creating it on first use.
+    
+    Returns:
+        AerSimulator: The process-wide simulator instance
+    """
+    global _simulator
+    if _simulator is None:
+        with _init_lock:
+            if _simulator is None:
+                from qiskit_aer import Aer
+                _simulator = Aer.get_backend('qasm_simulator')
+    return _simulator
+
+def warm_up_simulator() -> float:
+    """
+    Create the shared simulator and run a tiny circuit through it, so the
+    first real request does not pay backend initialization.
+    
+    Returns:
+        float: Seconds spent initializing and warming up the backend
+    """
+    from qiskit import QuantumCircuit
+    
+    start = time.perf_counter()
+    circuit = QuantumCircuit(1, 1)
+    circuit.h(0)
+    circuit.measure(0, 0)
+    run_circuits(circuit, shots=1)
+    elapsed = time.perf_counter() - start
+    logger.info("Simulator backend ready in %.1f ms", elapsed * 1000)
+    return elapsed
+
+@profiled('aer')
+def run_circuits(circuits: Union[QuantumCircuit, List[QuantumCircuit]], shots: int = 1):
+    """
+    Run one or more circuits on the shared simulator as a single job.
+    
+    Not serialized: each run() creates an independent AerJob whose
+    configuration is built from the backend options plus this call's
+    options, so concurrent request threads simulate in parallel.
+    
+    Args:
+        circuits (Union[QuantumCircuit, List[QuantumCircuit]]): Circuit(s) to execute
+        shots (int): Number of shots per circuit
+        
+    Returns:
+        Result: The qiskit result of the job
+    """
+    return get_simulator().run(circuits, shots=shots).result()
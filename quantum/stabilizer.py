@@ -0,0 +1,174 @@
+from __future__ import annotations
+from typing import TYPE_CHECKING, Dict, Optional
+import numpy as np
+from .exceptions import QuantumCircuitError
+from .profiling import profiled
+
+if TYPE_CHECKING:
+    from qiskit import QuantumCircuit
+
+def _g(x1: np.ndarray, z1: np.ndarray, x2: np.ndarray, z2: np.ndarray) -> np.ndarray:
+    """
+    Power of i picked up when multiplying Pauli (x1, z1) into Pauli (x2, z2),
+    summed over the last axis (Aaronson-Gottesman ``g`` function).
+    """
+    x1 = x1.astype(np.int8)
+    z1 = z1.astype(np.int8)
+    x2 = x2.astype(np.int8)
+    z2 = z2.astype(np.int8)
+    g = np.where(x1 & z1, z2 - x2,
+        np.where(x1, z2 * (2 * x2 - 1),
+        np.where(z1, x2 * (1 - 2 * z2), 0)))
+    return g.sum(axis=-1, dtype=np.int64)
+
+class StabilizerSimulator:
+    """
+    Stabilizer tableau simulator for Clifford circuits (Aaronson-Gottesman).
+
+    Keeps n destabilizer and n stabilizer generators as boolean X/Z matrices,
+    so each gate costs O(n) and each measurement at most O(n^2), instead of
+    the O(2^n) memory of a statevector.
+    """
+
+    def __init__(self, num_qubits: int, seed: Optional[int] = None):
+        """
+        Args:
+            num_qubits (int): Number of qubits, all starting in |0>
+            seed (Optional[int]): Seed for the outcomes of random measurements
+        """
+        n = num_qubits
+        self.num_qubits = n
+        self.x = np.zeros((2 * n, n), dtype=bool)
+        self.z = np.zeros((2 * n, n), dtype=bool)
+        self.r = np.zeros(2 * n, dtype=bool)
+        self.x[np.arange(n), np.arange(n)] = True          # destabilizers X_i
+        self.z[n + np.arange(n), np.arange(n)] = True      # stabilizers Z_i
+        self.rng = np.random.default_rng(seed)
+
+    def h(self, a: int) -> None:
+        self.r ^= self.x[:, a] & self.z[:, a]
+        self.x[:, a], self.z[:, a] = self.z[:, a].copy(), self.x[:, a].copy()
+
+    def s(self, a: int) -> None:
+        self.r ^= self.x[:, a] & self.z[:, a]
+        self.z[:, a] ^= self.x[:, a]
+
+    def sdg(self, a: int) -> None:
+        self.z[:, a] ^= self.x[:, a]
+        self.r ^= self.x[:, a] & self.z[:, a]
+
+    def x_gate(self, a: int) -> None:
+        self.r ^= self.z[:, a]
+
+    def z_gate(self, a: int) -> None:
+        self.r ^= self.x[:, a]
+
+    def y_gate(self, a: int) -> None:
+        self.r ^= self.x[:, a] ^ self.z[:, a]
+
+    def cx(self, a: int, b: int) -> None:
+        self.r ^= self.x[:, a] & self.z[:, b] & ~(self.x[:, b] ^ self.z[:, a])
+        self.x[:, b] ^= self.x[:, a]
+        self.z[:, a] ^= self.z[:, b]
+
+    def cz(self, a: int, b: int) -> None:
+        self.h(b)
+        self.cx(a, b)
+        self.h(b)
+
+    def measure(self, a: int) -> int:
+        """
+        Measure qubit a in the computational basis, collapsing the tableau.
+
+        Returns:
+            int: The measured bit
+        """
+        n = self.num_qubits
+        anticommuting = np.flatnonzero(self.x[n:, a])
+        if anticommuting.size:
+            # Random outcome: multiply the first anticommuting stabilizer into every other row that anticommutes
+            p = n + anticommuting[0]
+            rows = np.flatnonzero(self.x[:, a])
+            rows = rows[rows != p]
+            phase = (2 * self.r[rows] + 2 * self.r[p]
+                     + _g(self.x[p], self.z[p], self.x[rows], self.z[rows])) % 4
+            self.r[rows] = phase == 2
+            self.x[rows] ^= self.x[p]
+            self.z[rows] ^= self.z[p]
+            self.x[p - n], self.z[p - n], self.r[p - n] = self.x[p], self.z[p], self.r[p]
+            self.x[p] = False
+            self.z[p] = False
+            self.z[p, a] = True
+            outcome = int(self.rng.integers(2))
+            self.r[p] = bool(outcome)
+            return outcome
+
+        # Deterministic outcome: the sign of the product of the stabilizers paired
+        # with destabilizers that anticommute with Z_a. The running product before
+        # each factor is a prefix XOR, so every phase term is computed at once.
+        rows = n + np.flatnonzero(self.x[:n, a])
+        xs = self.x[rows]
+        zs = self.z[rows]
+        prefix_x = np.zeros_like(xs)
+        prefix_z = np.zeros_like(zs)
+        prefix_x[1:] = np.bitwise_xor.accumulate(xs, axis=0)[:-1]
+        prefix_z[1:] = np.bitwise_xor.accumulate(zs, axis=0)[:-1]
+        phase = (2 * int(self.r[rows].sum()) + int(_g(xs, zs, prefix_x, prefix_z).sum())) % 4
+        return int(phase == 2)
+
+# Gate name -> simulator call for the supported Clifford gates
+_GATES = {
+    'h': lambda sim, q: sim.h(q[0]),
+    's': lambda sim, q: sim.s(q[0]),
+    'sdg': lambda sim, q: sim.sdg(q[0]),
+    'x': lambda sim, q: sim.x_gate(q[0]),
+    'y': lambda sim, q: sim.y_gate(q[0]),
+    'z': lambda sim, q: sim.z_gate(q[0]),
+    'cx': lambda sim, q: sim.cx(q[0], q[1]),
+    'cz': lambda sim, q: sim.cz(q[0], q[1]),
+    'id': lambda sim, q: None,
+    'barrier': lambda sim, q: None,
+}
+
+@profiled('stabilizer')
+def run_clifford_circuit(circuit: QuantumCircuit, shots: int = 1,
+                         seed: Optional[int] = None) -> Dict[str, int]:
+    """
+    Simulate a Clifford circuit with a stabilizer tableau.
+
+    Runs in time polynomial in the number of qubits, so circuits with
+    thousands of qubits are practical.
+
+    Args:
+        circuit (QuantumCircuit): Circuit made of H, S, Sdg, X, Y, Z, CX, CZ and measurements
+        shots (int): Number of shots
+        seed (Optional[int]): Seed for random measurement outcomes
+
+    Returns:
+        Dict[str, int]: Counts keyed by classical bitstring, in qiskit order (highest clbit first)
+
+    Raises:
+        QuantumCircuitError: If the circuit contains a non-Clifford or unsupported instruction
+    """
+    instructions = []
+    for instruction in circuit.data:
+        name = instruction.operation.name
+        if name != 'measure' and name not in _GATES:
+            raise QuantumCircuitError(f"Instruction '{name}' is not supported by the stabilizer simulator")
+        qubits = [circuit.find_bit(q).index for q in instruction.qubits]
+        clbits = [circuit.find_bit(c).index for c in instruction.clbits]
+        instructions.append((name, qubits, clbits))
+
+    rng = np.random.default_rng(seed)
+    counts: Dict[str, int] = {}
+    for _ in range(shots):
+        sim = StabilizerSimulator(circuit.num_qubits, seed=rng)
+        bits = [0] * circuit.num_clbits
+        for name, qubits, clbits in instructions:
+            if name == 'measure':
+                bits[clbits[0]] = sim.measure(qubits[0])
+            else:
+                _GATES[name](sim, qubits)
+        key = ''.join(str(bit) for bit in reversed(bits))
+        counts[key] = counts.get(key, 0) + 1
+    return counts
@@ -0,0 +1,6 @@
+from .static_files import StaticFiles, IMMUTABLE, REVALIDATE
+from .metrics import MetricsRegistry, Counter, Gauge, Histogram
+from .admission import RateLimiter, ConcurrencyLimiter, ServerBusyError
+from .structured_logging import configure_logging, JsonFormatter, SamplingFilter, request_id_var
+
+__all__ = ['StaticFiles', 'IMMUTABLE', 'REVALIDATE', 'MetricsRegistry', 'Counter', 'Gauge', 'Histogram', 'RateLimiter', 'ConcurrencyLimiter', 'ServerBusyError', 'configure_logging', 'JsonFormatter', 'SamplingFilter', 'request_id_var']
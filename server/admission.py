@@ -0,0 +1,108 @@
+from collections import OrderedDict
+from typing import Callable, Optional, Tuple
+import math
+import threading
+import time
+
+class RateLimiter:
+    """
+    Token-bucket rate limiter keyed by client.
+
+    Each client gets a bucket of ``burst`` tokens refilled at ``rate`` tokens
+    per second; a request spends one token. Only the most recently seen
+    ``max_clients`` buckets are kept, so memory stays bounded.
+    """
+
+    def __init__(self, rate: float, burst: int, max_clients: int = 10000,
+                 clock: Callable[[], float] = time.monotonic):
+        """
+        Args:
+            rate (float): Tokens added per second (requests per second allowed on average); 0 disables limiting
+            burst (int): Bucket size (requests allowed back to back)
+            max_clients (int): Maximum number of client buckets remembered
+            clock (Callable[[], float]): Time source, in seconds
+        """
+        self.rate = rate
+        self.burst = max(1, burst)
+        self.max_clients = max_clients
+        self._clock = clock
+        self._buckets: "OrderedDict[str, Tuple[float, float]]" = OrderedDict()   # client -> (tokens, last refill)
+        self._lock = threading.Lock()
+
+    def acquire(self, client: str) -> Tuple[bool, float]:
+        """
+        Spend a token for a client.
+
+        Returns:
+            Tuple[bool, float]: Whether the request is allowed and, if not,
+                the seconds until a token is available
+        """
+        if self.rate <= 0:
+            return True, 0.0
+        now = self._clock()
+        with self._lock:
+            tokens, last = self._buckets.pop(client, (float(self.burst), now))
+            tokens = min(float(self.burst), tokens + (now - last) * self.rate)
+            allowed = tokens >= 1.0
+            if allowed:
+                tokens -= 1.0
+            self._buckets[client] = (tokens, now)
+            if len(self._buckets) > self.max_clients:
+                self._buckets.popitem(last=False)
+        return allowed, 0.0 if allowed else (1.0 - tokens) / self.rate
+
+class ConcurrencyLimiter:
+    """
+    Global cap on simultaneous simulations.
+
+    Requests wait at most ``max_wait`` seconds for a slot and are rejected
+    otherwise, so an overload is shed quickly instead of queueing without bound.
+    """
+
+    def __init__(self, limit: int, max_wait: float = 0.0):
+        """
+        Args:
+            limit (int): Maximum concurrent holders
+            max_wait (float): Seconds a request may wait for a free slot
+        """
+        self.limit = limit
+        self.max_wait = max_wait
+        self._semaphore = threading.BoundedSemaphore(limit)
+        self._in_use = 0
+        self._lock = threading.Lock()
+
+    def acquire(self) -> Optional[float]:
+        """
+        Take a slot, waiting up to max_wait.
+
+        Returns:
+            Optional[float]: Seconds spent waiting, or None if no slot became free
+        """
+        start = time.perf_counter()
+        if self.max_wait > 0:
+            acquired = self._semaphore.acquire(timeout=self.max_wait)
+        else:
+            acquired = self._semaphore.acquire(blocking=False)
+        if not acquired:
+            return None
+        with self._lock:
+            self._in_use += 1
+        return time.perf_counter() - start
+
+    def release(self) -> None:
+        with self._lock:
+            self._in_use -= 1
+        self._semaphore.release()
+
+    @property
+    def in_use(self) -> int:
+        """Slots currently held."""
+        return self._in_use
+
+class ServerBusyError(Exception):
+    """Raised when no simulation slot becomes free within the allowed wait."""
+    pass
+
+def retry_after_header(seconds: float) -> str:
+    """Retry-After value (whole seconds, at least 1) for a wait time."""
+    return str(max(1, math.ceil(seconds)))
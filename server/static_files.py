@@ -0,0 +1,121 @@
+from typing import Any, Dict, Optional
+from flask import Response, abort, request, send_file
+from werkzeug.security import safe_join
+import gzip
+import hashlib
+import mimetypes
+import os
+import threading
+
+try:
+    import brotli
+except ImportError:  # brotli is optional; gzip is always available
+    brotli = None
+
+# Text formats worth compressing; images are already compressed
+COMPRESSIBLE_TYPES = {
+    'text/html', 'text/css', 'text/javascript', 'application/javascript',
+    'application/json', 'image/svg+xml', 'text/plain'
+}
+
+# Content-hashed files never change, so browsers may keep them forever
+IMMUTABLE = 'public, max-age=31536000, immutable'
+# Always revalidate (cheap with ETags), e.g. for HTML pages that get edited
+REVALIDATE = 'no-cache'
+
+class StaticFiles:
+    """
+    Serves files with content-hash ETags, Cache-Control headers, conditional
+    GET (304) and precompressed gzip/brotli variants of text files.
+    
+    Hashes and compressed bodies are computed once per file version (keyed by
+    modification time and size) and kept in memory.
+    """
+    
+    def __init__(self, min_compress_size: int = 512):
+        """
+        Args:
+            min_compress_size (int): Files smaller than this many bytes are sent uncompressed
+        """
+        self.min_compress_size = min_compress_size
+        self._entries: Dict[str, Dict[str, Any]] = {}
+        self._lock = threading.Lock()
+    
+    def _entry(self, path: str) -> Dict[str, Any]:
+        stat = os.stat(path)
+        version = (stat.st_mtime_ns, stat.st_size)
+        with self._lock:
+            entry = self._entries.get(path)
+        if entry is not None and entry['version'] == version:
+            return entry
+        
+        with open(path, 'rb') as f:
+            body = f.read()
+        mimetype = mimetypes.guess_type(path)[0] or 'application/octet-stream'
+        entry = {
+            'version': version,
+            'mimetype': mimetype,
+            'etag': hashlib.sha256(body).hexdigest()[:20],
+            'encodings': {}
+        }
+        if mimetype in COMPRESSIBLE_TYPES and len(body) >= self.min_compress_size:
+            entry['encodings']['identity'] = body
+            entry['encodings']['gzip'] = gzip.compress(body, compresslevel=9, mtime=0)
+            if brotli is not None:
+                entry['encodings']['br'] = brotli.compress(body)
+        with self._lock:
+            self._entries[path] = entry
+        return entry
+    
+    def precompress(self, directory: str) -> int:
+        """
+        Hash and compress every file under a directory ahead of time.
+        
+        Returns:
+            int: Number of files processed
+        """
+        count = 0
+        for root, _, files in os.walk(directory):
+            for name in files:
+                self._entry(os.path.join(root, name))
+                count += 1
+        return count
+    
+    def _choose_encoding(self, encodings: Dict[str, bytes]) -> Optional[str]:
+        accepted = request.accept_encodings
+        for encoding in ('br', 'gzip'):
+            if encoding in encodings and accepted[encoding]:
+                return encoding
+        return 'identity' if encodings else None
+    
+    def send(self, directory: str, filename: str, cache_control: str = REVALIDATE) -> Response:
+        """
+        Build the response for a file inside directory.
+        
+        Args:
+            directory (str): Directory the file must live in
+            filename (str): Path relative to directory (from the URL)
+            cache_control (str): Cache-Control header value
+            
+        Returns:
+            Response: 200 with the (possibly compressed) file, or 304 if the client copy is current
+        """
+        path = safe_join(directory, filename)
+        if path is None or not os.path.isfile(path):
+            abort(404)
+        entry = self._entry(path)
+        
+        encoding = self._choose_encoding(entry['encodings'])
+        if encoding is None:
+            response = send_file(os.path.abspath(path), mimetype=entry['mimetype'],
+                                 etag=entry['etag'], conditional=True, max_age=None)
+        else:
+            etag = entry['etag'] if encoding == 'identity' else f"{entry['etag']}-{encoding}"
+            response = Response(entry['encodings'][encoding], mimetype=entry['mimetype'])
+            if encoding != 'identity':
+                response.headers['Content-Encoding'] = encoding
+            response.headers['Vary'] = 'Accept-Encoding'
+            response.set_etag(etag)
+            response = response.make_conditional(request)
+        response.headers['Cache-Control'] = cache_control
+        return response
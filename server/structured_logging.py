@@ -0,0 +1,121 @@
+from contextvars import ContextVar
+from typing import Dict, Optional
+import json
+import logging
+import random
+import sys
+import time
+
+# Correlation id of the request being handled, added to every log record
+request_id_var: ContextVar[Optional[str]] = ContextVar('request_id', default=None)
+
+# Attributes every LogRecord has; anything else was passed with `extra=` and is logged as a field
+_STANDARD_ATTRS = set(vars(logging.LogRecord('', 0, '', 0, '', (), None))) | {'message', 'asctime', 'request_id'}
+
+class RequestIdFilter(logging.Filter):
+    """Stamps each record with the current request id (None outside a request)."""
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        record.request_id = request_id_var.get()
+        return True
+
+class SamplingFilter(logging.Filter):
+    """
+    Keeps only a fraction of the records below WARNING, per logger.
+
+    Rates are looked up by logger name and then by its parents
+    ('quantum.bernstein_vazirani', then 'quantum'); loggers without a rate
+    keep everything. Warnings and errors are never dropped.
+    """
+
+    def __init__(self, rates: Optional[Dict[str, float]] = None, rng: Optional[random.Random] = None):
+        """
+        Args:
+            rates (Optional[Dict[str, float]]): Fraction of records kept (0 to 1) by logger name
+            rng (Optional[random.Random]): Random source, for reproducible sampling
+        """
+        super().__init__()
+        self.rates = dict(rates or {})
+        self._rng = rng or random.Random()
+        self._cache: Dict[str, float] = {}
+
+    def _rate(self, name: str) -> float:
+        rate = self._cache.get(name)
+        if rate is None:
+            rate = 1.0
+            prefix = name
+            while prefix:
+                if prefix in self.rates:
+                    rate = self.rates[prefix]
+                    break
+                prefix = prefix.rpartition('.')[0]
+            self._cache[name] = rate
+        return rate
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if record.levelno >= logging.WARNING:
+            return True
+        rate = self._rate(record.name)
+        return rate >= 1.0 or self._rng.random() < rate
+
+class JsonFormatter(logging.Formatter):
+    """Formats records as one JSON object per line."""
+
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            'time': time.strftime('%Y-%m-%dT%H:%M:%S', time.gmtime(record.created)) + f'.{int(record.msecs):03d}Z',
+            'level': record.levelname,
+            'logger': record.name,
+            'message': record.getMessage(),
+            'request_id': getattr(record, 'request_id', None)
+        }
+        for key, value in vars(record).items():
+            if key not in _STANDARD_ATTRS and not key.startswith('_'):
+                entry[key] = value
+        if record.exc_info:
+            entry['exception'] = self.formatException(record.exc_info)
+        return json.dumps(entry, default=str)
+
+def parse_sample_rates(spec: str) -> Dict[str, float]:
+    """
+    Parse sampling rates written as 'logger=rate,other.logger=rate'.
+
+    Raises:
+        ValueError: If an entry is malformed or a rate is outside [0, 1]
+    """
+    rates = {}
+    for item in filter(None, (part.strip() for part in spec.split(','))):
+        name, _, value = item.partition('=')
+        rate = float(value)
+        if not name or not 0.0 <= rate <= 1.0:
+            raise ValueError(f"Invalid log sample rate '{item}'")
+        rates[name.strip()] = rate
+    return rates
+
+def configure_logging(level: str = 'INFO', json_format: bool = True,
+                      sample_rates: Optional[Dict[str, float]] = None) -> logging.Handler:
+    """
+    Replace the root handlers with one that writes (optionally JSON) lines to stderr.
+
+    Args:
+        level (str): Root log level
+        json_format (bool): JSON lines if True, plain text (with the request id) otherwise
+        sample_rates (Optional[Dict[str, float]]): Per-logger fraction of sub-WARNING records kept
+
+    Returns:
+        logging.Handler: The installed handler
+    """
+    handler = logging.StreamHandler(sys.stderr)
+    handler.addFilter(RequestIdFilter())
+    if sample_rates:
+        handler.addFilter(SamplingFilter(sample_rates))
+    if json_format:
+        handler.setFormatter(JsonFormatter())
+    else:
+        handler.setFormatter(logging.Formatter('%(levelname)s:%(name)s:[%(request_id)s] %(message)s'))
+    root = logging.getLogger()
+    for existing in list(root.handlers):
+        root.removeHandler(existing)
+    root.addHandler(handler)
+    root.setLevel(level)
+    return handler